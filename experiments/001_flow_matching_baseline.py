@@ -392,19 +392,21 @@ def val_loss(model: FlowMatchingPolicy, val_cache: list[TrainBatch]) -> tuple[fl
     was_training = model.training
     model.eval()
     gen = torch.Generator(device=DEVICE).manual_seed(0)
-    total = 0.0
+    # Per-batch [total | breakdown] rows stay on the device and cross to the host in one transfer
+    # at the end, not a sync per batch plus a Python add per breakdown key.
+    rows: list[Tensor] = []
+    names: list[str] = []
     count = 0
-    breakdown_sums: dict[str, float] = {}
     for batch in val_cache:
         n = batch.target.shape[0]
         err2 = flow_loss(model, batch, gen=gen)
-        total += err2.mean().item() * n
-        for k, v in velocity_mse_breakdown(err2).items():
-            breakdown_sums[k] = breakdown_sums.get(k, 0.0) + v * n
+        names, terms = _velocity_mse_terms(err2)
+        rows.append(torch.cat([err2.mean()[None], terms]).double() * n)
         count += n
     if was_training:
         model.train()
-    return total / count, {k: s / count for k, s in breakdown_sums.items()}
+    total, *breakdown_sums = (s / count for s in torch.stack(rows).sum(0).tolist())
+    return total, dict(zip(names, breakdown_sums))
 
 
 # Channel split inside the A_DIM=14 action vec: [0:6] sticks+triggers (continuous), [6:14] buttons {0,1}.
@@ -427,6 +429,13 @@ def velocity_mse_breakdown(err2: Float[Tensor, "B L_chunk d_action"]) -> dict[st
     ``modality/<name>``: mean over batch, all frames, that modality's channels.
     ``horizon/frame_<k>``: mean over batch, all channels, chunk position k (k frames
     into the future). One host sync (a single ``.tolist()``)."""
+    names, vals = _velocity_mse_terms(err2)
+    return dict(zip(names, vals.tolist()))
+
+
+def _velocity_mse_terms(err2: Float[Tensor, "B L_chunk d_action"]) -> tuple[list[str], Tensor]:
+    """``velocity_mse_breakdown``'s keys and its values as one device tensor, for callers that
+    accumulate across batches before syncing."""
     names: list[str] = []
     vals: list[Tensor] = []
     for name, sl in ACTION_MODALITIES.items():
@@ -436,16 +445,23 @@ def velocity_mse_breakdown(err2: Float[Tensor, "B L_chunk d_action"]) -> dict[st
     for k in range(per_frame.shape[0]):
         names.append(f"horizon/frame_{k + 1:02d}")
         vals.append(per_frame[k])
-    return dict(zip(names, torch.stack(vals).tolist()))
+    return names, torch.stack(vals)
 
 
 @torch.no_grad()
-def recon_metrics(model: FlowMatchingPolicy, val_cache: list[TrainBatch], *, n_steps: int) -> dict[str, float]:
+def recon_metrics(
+    model: FlowMatchingPolicy,
+    val_cache: list[TrainBatch],
+    *,
+    n_steps: int,
+    keep_preds: list[Tensor] | None = None,
+) -> dict[str, float]:
     """Sample-space reconstruction on cached val batches: integrate a chunk from
     noise (FIXED seed) and score it against the ground-truth chunk. Velocity MSE
     (``val_loss``) is a weak proxy for sample quality — this tracks what the
     closed-loop driver actually executes. Buttons → accuracy + F1 at the 0.5
-    decode threshold; sticks/triggers → MAE."""
+    decode threshold; sticks/triggers → MAE. Pass ``keep_preds`` to collect the
+    per-batch decoded chunks instead of re-integrating them afterwards."""
     was_training = model.training
     model.eval()
     gen = torch.Generator(device=DEVICE).manual_seed(0)
@@ -454,6 +470,8 @@ def recon_metrics(model: FlowMatchingPolicy, val_cache: list[TrainBatch], *, n_s
     cont_count = 0
     for batch in val_cache:
         pred = integrate_chunk(model, batch.context, n_steps=n_steps, gen=gen)
+        if keep_preds is not None:
+            keep_preds.append(pred)
         tgt = batch.target
         pb = pred[..., _N_CONT:] > 0.5
         tb = tgt[..., _N_CONT:] > 0.5
@@ -801,25 +819,27 @@ def diagnose(ckpt_path: str, *, n_batches: int = 16, k_samples: int = 8) -> None
 
     print("\n[diag] reconstruction sweep over n_flow_steps", flush=True)
     print(f"  {'steps':>6} {'btn_acc':>8} {'btn_f1':>8} {'cont_mae':>9}", flush=True)
+    # the sweep's seed-0 decode at cfg.n_flow_steps is exactly the histogram sample below: keep it
+    kept: list[Tensor] = []
     for n in (8, 32, 64):
-        m = recon_metrics(model, val_cache, n_steps=n)
+        m = recon_metrics(model, val_cache, n_steps=n, keep_preds=kept if n == cfg.n_flow_steps else None)
         print(
             f"  {n:>6} {m['recon_button_acc']:>8.3f} {m['recon_button_f1']:>8.3f} {m['recon_cont_mae']:>9.4f}",
             flush=True,
         )
 
-    gen = torch.Generator(device=DEVICE).manual_seed(0)
-    pred = torch.cat(
-        [
-            integrate_chunk(model, b.context, n_steps=cfg.n_flow_steps, gen=gen).reshape(-1, A_DIM).cpu()
-            for b in val_cache
-        ]
-    ).numpy()
+    if not kept:
+        gen = torch.Generator(device=DEVICE).manual_seed(0)
+        kept = [integrate_chunk(model, b.context, n_steps=cfg.n_flow_steps, gen=gen) for b in val_cache]
+    pred = torch.cat([p.reshape(-1, A_DIM).cpu() for p in kept]).numpy()
     tgt = torch.cat([b.target.reshape(-1, A_DIM).cpu() for b in val_cache]).numpy()
     fig, axes = plt.subplots(3, 5, figsize=(20, 10))
     for i, (ax, ch) in enumerate(zip(axes.ravel(), ACTION_CHANNELS)):
-        ax.hist(tgt[:, i], bins=60, alpha=0.5, density=True, label="gt")
-        ax.hist(pred[:, i], bins=60, alpha=0.5, density=True, label="pred")
+        # bin in numpy and draw one filled step artist per series; ax.hist builds a Rectangle
+        # patch per bin, which dominates the Agg render across 15 panels x 2 series x 60 bins
+        for x, label in ((tgt[:, i], "gt"), (pred[:, i], "pred")):
+            density, edges = np.histogram(x, bins=60, density=True)
+            ax.stairs(density, edges, fill=True, alpha=0.5, label=label)
         if ch.startswith("button_") or "trigger" in ch:
             ax.axvline(0.5, color="k", lw=0.6)
         ax.set_title(ch, fontsize=9)
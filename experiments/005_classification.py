@@ -470,9 +470,7 @@ def decode(
         """Categorical choice over the last logit dim: greedy mode, or a ``temp``-scaled draw."""
         if mode == "argmax":
             return logits.argmax(-1)
-        probs = F.softmax(logits / temp, dim=-1)
-        flat = torch.multinomial(probs.reshape(-1, probs.shape[-1]), 1, generator=gen)
-        return flat.reshape(logits.shape[:-1])
+        return scoring.sample_categorical(logits, temp=temp, gen=gen)
 
     if model.continuous_head_kind == "naive_bins":
         cont = scoring.idx_to_centers(pick(lg["cont"]), model.cont_binspecs)  # [B,H,6]
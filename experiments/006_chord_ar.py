@@ -239,9 +239,10 @@ def quantize_actions(actions: Float[Tensor, "*b d_action"]) -> Int[Tensor, "*b"]
     """Raw A_DIM action vectors → chord ids via the shared ``hal.training.scoring`` quantizers
     (the same code 005's stick_clusters targets use, so the two stay byte-comparable)."""
     cont, btn = actions[..., :_N_CONT], actions[..., _N_CONT:]
-    main = scoring.nearest_cluster(cont[..., 0:2], scoring.STICK_CLUSTER_CENTERS_MAIN)
-    c = scoring.nearest_cluster(cont[..., 2:4], scoring.STICK_CLUSTER_CENTERS_C)
-    trig = scoring.nearest_center(cont[..., 4:6], scoring.TRIGGER_CENTERS)  # [*b, 2]
+    main_centers, c_centers, trig_centers = scoring.centers_on(actions.device)
+    main = scoring.nearest_cluster(cont[..., 0:2], main_centers)
+    c = scoring.nearest_cluster(cont[..., 2:4], c_centers)
+    trig = scoring.nearest_center(cont[..., 4:6], trig_centers)  # [*b, 2]
     return pack_chord(main, c, trig[..., 0], trig[..., 1], scoring.buttons_to_combo(btn))
 
 
@@ -250,12 +251,13 @@ def chord_to_actions(chord: Int[Tensor, "*b"]) -> Float[Tensor, "*b d_action"]:
     """Inverse of ``quantize_actions`` up to quantization: chord id → raw A_DIM action vector
     (``[-1,1]`` sticks, ``[0,1]`` triggers, ``{0,1}`` buttons) via the scoring inverses."""
     main, c, tl, tr, btn = unpack_chord(chord)
+    main_centers, c_centers, trig_centers = scoring.centers_on(chord.device)
     return torch.cat(
         [
-            scoring.cluster_to_xy(main, scoring.STICK_CLUSTER_CENTERS_MAIN),
-            scoring.cluster_to_xy(c, scoring.STICK_CLUSTER_CENTERS_C),
-            scoring.center_to_value(tl, scoring.TRIGGER_CENTERS)[..., None],
-            scoring.center_to_value(tr, scoring.TRIGGER_CENTERS)[..., None],
+            scoring.cluster_to_xy(main, main_centers),
+            scoring.cluster_to_xy(c, c_centers),
+            scoring.center_to_value(tl, trig_centers)[..., None],
+            scoring.center_to_value(tr, trig_centers)[..., None],
             scoring.combo_to_buttons(btn),
         ],
         dim=-1,
@@ -313,29 +315,24 @@ class ChordVocab:
         k999 = int((cum < 0.999).sum()) + 1
         return f"{self.size} chords / {total:.0f} scanned frames; 99% mass in {k99}, 99.9% in {k999}"
 
-    def _map_oov(self, cid: int) -> int:
-        """Deterministic projection of one out-of-vocab chord id onto a vocab index: prefer the
-        same (btn, tl, tr) with lexicographically nearest (main-center, c-center) squared
+    def _map_oov(self, cids: Int[Tensor, " U"]) -> Int[Tensor, " U"]:
+        """Deterministic projection of unique out-of-vocab chord ids (CPU) onto vocab indices: prefer
+        the same (btn, tl, tr) with lexicographically nearest (main-center, c-center) squared
         distance; fall back to same btn nearest sticks; final fallback the most frequent chord
-        (index 0). Cached per unique OOV id."""
-        hit = self._oov_cache.get(cid)
-        if hit is not None:
-            return hit
-        main, c, tl, tr, btn = (int(x) for x in unpack_chord(torch.tensor(cid, dtype=torch.long)))
-        tiers = (
-            (self._v_btn == btn) & (self._v_tl == tl) & (self._v_tr == tr),
-            self._v_btn == btn,
-        )
-        out = 0  # most frequent chord
-        for tier in tiers:
-            if bool(tier.any()):
-                d_main = self._main_d2[main, self._v_main].masked_fill(~tier, math.inf)
-                near = d_main <= d_main.min() + 1e-9
-                d_c = self._c_d2[c, self._v_c].masked_fill(~near, math.inf)
-                out = int(d_c.argmin())  # argmin's first-index tie-break = most frequent
-                break
-        self._oov_cache[cid] = out
-        return out
+        (index 0). Every uncached id resolves in one batched pass — ``[U, V]`` tier masks and
+        center-distance rows gathered from the pairwise tables, masked, then a row argmin.
+        Cached per unique OOV id."""
+        todo = [cid for cid in cids.tolist() if cid not in self._oov_cache]
+        if todo:
+            main, c, tl, tr, btn = (x[:, None] for x in unpack_chord(torch.tensor(todo, dtype=torch.long)))
+            exact = (self._v_btn == btn) & (self._v_tl == tl) & (self._v_tr == tr)
+            tier = torch.where(exact.any(1, keepdim=True), exact, self._v_btn == btn)  # first non-empty tier
+            d_main = self._main_d2[main, self._v_main].masked_fill(~tier, math.inf)
+            near = d_main <= d_main.min(1, keepdim=True).values + 1e-9
+            d_c = self._c_d2[c, self._v_c].masked_fill(~near, math.inf)
+            out = torch.where(tier.any(1), d_c.argmin(1), 0)  # argmin's first-index tie-break = most frequent
+            self._oov_cache.update(zip(todo, out.tolist()))
+        return torch.tensor([self._oov_cache[cid] for cid in cids.tolist()], dtype=torch.int32)
 
     @jaxtyped(typechecker=beartype)
     def encode(self, chords: Int[Tensor, "*b"]) -> tuple[Int[Tensor, "*b"], Bool[Tensor, "*b"]]:
@@ -346,8 +343,8 @@ class ChordVocab:
         idx = self._lut[chords]
         oov = idx < 0
         if bool(oov.any()):
-            for cid in torch.unique(chords[oov]).tolist():
-                idx[chords == cid] = self._map_oov(cid)
+            uniq, inv = torch.unique(chords[oov], return_inverse=True)
+            idx[oov] = self._map_oov(uniq.cpu()).to(idx.device)[inv]
         return idx.long(), oov
 
 
@@ -362,10 +359,12 @@ def build_chord_vocab(batches: Iterable[TrainBatch], *, frame_budget: int) -> Ch
     counts = torch.zeros(N_CHORD_SPACE, dtype=torch.long)
     seen = 0
     for batch in batches:
-        ctx = batch.context
+        ctx = batch.context.widen()  # raw loader batches carry uint8 buttons / int32 ids
         hist = stack_actions(ctx.features)  # [B, L_ctx, A_DIM]
         valid = torch.arange(hist.shape[1])[None, :] >= ctx.ctx_pad[:, None]
-        ids = torch.cat([quantize_actions(hist)[valid], quantize_actions(batch.target).reshape(-1)])
+        # Context history and target chunk quantize as ONE stacked batch of frames (and only the
+        # valid history rows), not two separate passes through the center-distance kernels.
+        ids = quantize_actions(torch.cat([hist[valid], batch.target.reshape(-1, A_DIM)]))
         counts += torch.bincount(ids, minlength=N_CHORD_SPACE)
         seen += ids.numel()
         if seen >= frame_budget:
@@ -634,7 +633,7 @@ def decode(
         if mode == "argmax":
             idx_k = logits_k.argmax(-1)
         else:
-            idx_k = torch.multinomial(F.softmax(logits_k / temp, dim=-1), 1, generator=gen).squeeze(-1)
+            idx_k = scoring.sample_categorical(logits_k, temp=temp, gen=gen)
         picked[:, k] = idx_k
         if k + 1 < H:
             prev[:, k + 1] = idx_k
@@ -549,8 +549,7 @@ def decode(
         ``temp``-scaled draw. ``logits [B, K]`` → ``[B]``."""
         if mode == "argmax":
             return logits.argmax(-1)
-        probs = F.softmax(logits / temp, dim=-1)
-        return torch.multinomial(probs, 1, generator=gen).squeeze(-1)
+        return scoring.sample_categorical(logits, temp=temp, gen=gen)
 
     for t in range(S):
         g = t % N_GROUPS
@@ -712,8 +712,7 @@ def decode(
     def pick(logits: Tensor) -> Tensor:
         if mode == "argmax":
             return logits.argmax(-1)
-        probs = F.softmax(logits / temp, dim=-1)
-        return torch.multinomial(probs, 1, generator=gen).squeeze(-1)
+        return scoring.sample_categorical(logits, temp=temp, gen=gen)
 
     for e in range(L):
         chord_logits, _ = model.head(cond, chord_of_event, dur_index)
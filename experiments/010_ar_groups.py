@@ -301,6 +301,7 @@ class GPT(nn.Module):
         if not cfg.decode_temp > 0:
             raise ValueError(f"decode_temp must be > 0, got {cfg.decode_temp}")
         self.L_ctx = cfg.L_ctx
+        self.d_group = cfg.d_group
 
         # Gamestate categoricals: one table per feature name, shared across the four players.
         self.cat_embeds = nn.ModuleDict(
@@ -314,18 +315,39 @@ class GPT(nn.Module):
         self.ctx_proj = nn.Linear(d_in, cfg.d_model)
         self.blocks = nn.ModuleList([Block(cfg) for _ in range(cfg.n_layers)])
 
-        # Autoregressive-groups head: group g's input is the hidden plus the embedded realized classes
-        # of groups 0..g-1, so its linear's in-dim grows by d_group per earlier group.
+        # Autoregressive-groups head: group g's logits are linear in [hidden | embedded realized classes of
+        # groups 0..g-1]. That linear is split by input: the hidden term of all four groups is ONE fused
+        # ``h_out`` (one matmul, one read of the hidden, split per group), and group g >= 1 adds a small
+        # bias-free ``cond_out[g-1]`` over its d_group-per-earlier-group conditioning embeddings.
+        # Initialized at the unsplit linear's scale (see ``_init_group_heads``).
         self.group_in = nn.ModuleList([nn.Embedding(_GROUP_VOCABS[g], cfg.d_group) for g in range(N_GROUPS - 1)])
-        self.group_out = nn.ModuleList(
-            [nn.Linear(cfg.d_model + g * cfg.d_group, _GROUP_VOCABS[g]) for g in range(N_GROUPS)]
+        self.h_out = nn.Linear(cfg.d_model, sum(_GROUP_VOCABS))
+        self.cond_out = nn.ModuleList(
+            [nn.Linear(g * cfg.d_group, _GROUP_VOCABS[g], bias=False) for g in range(1, N_GROUPS)]
         )
+        self._init_group_heads(cfg.d_model, cfg.d_group)
+        self._register_load_state_dict_pre_hook(_merge_group_out)
 
         # Stick/trigger center grids (registered so they move with .to() and serialize).
         self.register_buffer("main_centers", scoring.STICK_CLUSTER_CENTERS_MAIN.clone())
         self.register_buffer("c_centers", scoring.STICK_CLUSTER_CENTERS_C.clone())
         self.register_buffer("trig_centers", scoring.TRIGGER_CENTERS.clone())
 
+    @torch.no_grad()
+    def _init_group_heads(self, d_model: int, d_group: int) -> None:
+        """Draw every piece of group g's split linear (its ``h_out`` rows + bias, its ``cond_out``) from
+        U(±1/sqrt(d_model + g * d_group)): the default ``nn.Linear`` init of the unsplit per-group linear
+        over ``[hidden | cond]``. Left at their own defaults, ``h_out`` and especially the narrow
+        ``cond_out`` would start at a larger scale than the pre-fusion head did."""
+        rows = self.h_out.weight.split(_GROUP_VOCABS)
+        biases = self.h_out.bias.split(_GROUP_VOCABS)
+        for g in range(N_GROUPS):
+            bound = 1.0 / math.sqrt(d_model + g * d_group)
+            rows[g].uniform_(-bound, bound)
+            biases[g].uniform_(-bound, bound)
+            if g >= 1:
+                self.cond_out[g - 1].weight.uniform_(-bound, bound)
+
     def _per_player_features(self, features: dict[str, Tensor], prefix: str) -> Tensor:
         ref = features[f"{prefix}_position_x"]
         B, L = ref.shape
@@ -363,35 +385,61 @@ class GPT(nn.Module):
             x = block(x, mask)
         return rmsnorm(x)
 
+    def _group_logits(self, g: int, h_logits: tuple[Tensor, ...], cond: Tensor) -> Tensor:
+        """Group g's fp32 logits: its slice of the fused hidden projection, plus (g >= 1) the
+        conditioning term over the embedded realized classes of groups 0..g-1 — the leading
+        ``g·d_group`` columns of ``cond`` ``[..., (N_GROUPS-1)·d_group]``."""
+        if g == 0:
+            return h_logits[0].float()
+        return (h_logits[g] + self.cond_out[g - 1](cond[..., : g * self.d_group])).float()
+
     def head_logits(self, h: Tensor, tgt_idx: Tensor) -> list[Tensor]:
         """Teacher-forced per-group logits ``[..., vocab_g]``. Group g's head sees the hidden plus the
         embedded REALIZED (target) classes of groups 0..g-1, so one parallel forward yields all four."""
-        cond = [h]
-        out: list[Tensor] = []
-        for g in range(N_GROUPS):
-            out.append(self.group_out[g](torch.cat(cond, dim=-1)).float())
-            if g < N_GROUPS - 1:
-                cond.append(self.group_in[g](tgt_idx[..., g]).to(h.dtype))
-        return out
+        h_logits = self.h_out(h).split(_GROUP_VOCABS, dim=-1)
+        # Every target class is known up front: embed them once into one buffer each group reads a prefix of.
+        cond = torch.cat([self.group_in[g](tgt_idx[..., g]) for g in range(N_GROUPS - 1)], dim=-1).to(h.dtype)
+        return [self._group_logits(g, h_logits, cond) for g in range(N_GROUPS)]
 
     def head_decode(self, h: Tensor, *, temp: float, argmax: bool, gen: torch.Generator | None) -> Tensor:
         """Sequentially decode the four groups for one frame (``h`` ``[B, d_model]``); group g
         conditions on the SAMPLED classes of groups 0..g-1. Returns class indices ``[B, N_GROUPS]``."""
-        cond = [h]
+        h_logits = self.h_out(h).split(_GROUP_VOCABS, dim=-1)
+        # Preallocated conditioning buffer: each sampled class writes its embedding into its own slice
+        # in place (decode runs without autograd), instead of re-concatenating the growing prefix.
+        cond = h.new_empty((*h.shape[:-1], (N_GROUPS - 1) * self.d_group))
         picks: list[Tensor] = []
         for g in range(N_GROUPS):
-            lg = self.group_out[g](torch.cat(cond, dim=-1)).float()
-            c = (
-                lg.argmax(-1)
-                if argmax
-                else torch.multinomial(F.softmax(lg / temp, dim=-1), 1, generator=gen).squeeze(-1)
-            )
+            lg = self._group_logits(g, h_logits, cond)
+            c = lg.argmax(-1) if argmax else scoring.sample_categorical(lg, temp=temp, gen=gen)
             picks.append(c)
             if g < N_GROUPS - 1:
-                cond.append(self.group_in[g](c).to(h.dtype))
+                cond[..., g * self.d_group : (g + 1) * self.d_group] = self.group_in[g](c)
         return torch.stack(picks, dim=-1)
 
 
+def _is_pre_fusion(state_dict: dict[str, Tensor], prefix: str = "") -> bool:
+    """Whether a model state_dict still has the per-group ``group_out.{g}`` layout ``_merge_group_out`` folds."""
+    return f"{prefix}group_out.0.weight" in state_dict
+
+
+def _merge_group_out(state_dict: dict[str, Tensor], prefix: str, *args) -> None:
+    """``load_state_dict`` pre-hook: rewrite a pre-fusion checkpoint's per-group ``group_out.{g}``
+    linears over ``[hidden | cond]`` into the fused ``h_out`` (hidden columns, stacked across groups,
+    plus the biases) and ``cond_out.{g-1}`` (the conditioning columns). Exact: same logits. Only the
+    weights fold: the optimizer's param list changed with the split, so a pre-fusion run resumes with
+    fresh optimizer state (see ``train``)."""
+    if not _is_pre_fusion(state_dict, prefix):
+        return
+    ws = [state_dict.pop(f"{prefix}group_out.{g}.weight") for g in range(N_GROUPS)]
+    bs = [state_dict.pop(f"{prefix}group_out.{g}.bias") for g in range(N_GROUPS)]
+    d_model = ws[0].shape[1]
+    state_dict[f"{prefix}h_out.weight"] = torch.cat([w[:, :d_model] for w in ws])
+    state_dict[f"{prefix}h_out.bias"] = torch.cat(bs)
+    for g in range(1, N_GROUPS):
+        state_dict[f"{prefix}cond_out.{g - 1}.weight"] = ws[g][:, d_model:]
+
+
 # %%
 def _quantize(model: GPT, actions: Tensor) -> Tensor:
     return quantize_groups(model.main_centers, model.c_centers, model.trig_centers, actions)
@@ -635,8 +683,14 @@ def train(
     opt = AdamW(model.parameters(), lr=cfg.lr, betas=(0.9, 0.95), weight_decay=cfg.weight_decay)
     sched = LambdaLR(opt, lr_schedule(cfg))
     if resume_state is not None:
+        legacy_heads = _is_pre_fusion(resume_state["model"])
         model.load_state_dict(resume_state["model"])
-        opt.load_state_dict(resume_state["opt"])
+        if legacy_heads:
+            # group_out.{g} were separate AdamW params before the split; their moments don't map onto
+            # h_out / cond_out, so restart the optimizer rather than fail the param-count check.
+            print(f"[resume] {run_name}: pre-fusion group heads checkpoint, optimizer state NOT restored", flush=True)
+        else:
+            opt.load_state_dict(resume_state["opt"])
         sched.load_state_dict(resume_state["sched"])
         print(f"[resume] {run_name}: continuing from step {start_step}", flush=True)
 
@@ -420,14 +420,11 @@ def decode(
     Each group's logit slice is sampled (``temp``-scaled softmax) or taken greedily (``argmax``,
     for the recon metric) independently."""
     logits = model(ctx.features, ctx.ctx_pad)[:, -1]  # [B, A_VOCAB]
-    picks: list[Tensor] = []
-    for g in range(N_GROUPS):
-        lo = _GROUP_OFFSETS[g]
-        lg = logits[:, lo : lo + _GROUP_VOCABS[g]]
-        if argmax:
-            picks.append(lg.argmax(-1))
-        else:
-            picks.append(torch.multinomial(F.softmax(lg / temp, dim=-1), 1, generator=gen).squeeze(-1))
+    if not argmax:
+        # One Gumbel perturbation of the joint vector: each group's slice argmax is then a sample
+        # from that group's temp-scaled softmax.
+        logits = scoring.gumbel_perturb(logits, temp=temp, gen=gen)
+    picks = [logits[:, lo : lo + v].argmax(-1) for lo, v in zip(_GROUP_OFFSETS, _GROUP_VOCABS, strict=True)]
     idx = torch.stack(picks, dim=-1)  # [B, N_GROUPS]
     return _dequantize(model, idx)[:, None, :]
 
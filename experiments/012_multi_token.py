@@ -28,6 +28,7 @@ os.environ["PYTORCH_ALLOC_CONF"] = "expandable_segments:True"
 os.environ["HF_HUB_DISABLE_PROGRESS_BARS"] = "1"
 
 import contextlib
+import functools
 import itertools
 import json
 import math
@@ -67,6 +68,7 @@ from hal.training.checkpoints import load_for_resume
 from hal.training.checkpoints import save_checkpoint
 from hal.training.closed_loop import RecedingHorizon
 from hal.training.dataloader import make_loader
+from hal.training.dataloader import prefetch_to_device
 from hal.training.features import A_DIM
 from hal.training.features import ACTION_CHANNELS
 from hal.training.features import CAT_FEATURES
@@ -259,9 +261,9 @@ def apply_rotary_emb(
 
 @jaxtyped(typechecker=beartype)
 def rmsnorm(x0: Float[Tensor, "... d"], eps: float = 1e-6) -> Float[Tensor, "... d"]:
-    x = x0.float()
-    x = x * torch.rsqrt(x.pow(2).mean(-1, keepdim=True) + eps)
-    return x.type_as(x0)
+    # F.rms_norm is one fused reduction+scale kernel; the hand-rolled pow/mean/rsqrt/mul chain launched
+    # four and round-tripped the fp32 upcast through HBM between each. Still normalized in fp32.
+    return F.rms_norm(x0.float(), (x0.size(-1),), eps=eps).type_as(x0)
 
 
 class CausalSelfAttention(nn.Module):
@@ -276,7 +278,9 @@ class CausalSelfAttention(nn.Module):
         self.rotary = Rotary(self.head_dim)
 
     @jaxtyped(typechecker=beartype)
-    def forward(self, x: Float[Tensor, "B L d_model"], mask: Bool[Tensor, "B 1 L L"]) -> Float[Tensor, "B L d_model"]:
+    def forward(
+        self, x: Float[Tensor, "B L d_model"], mask: Bool[Tensor, "B 1 L L"] | None
+    ) -> Float[Tensor, "B L d_model"]:
         B, L, _ = x.shape
         q, k, v = self.c_attn(x).split(self.d_model, dim=2)
         q = q.view(B, L, self.n_heads, self.head_dim)
@@ -285,7 +289,11 @@ class CausalSelfAttention(nn.Module):
         cos, sin = self.rotary(q)
         q = apply_rotary_emb(q, cos, sin)
         k = apply_rotary_emb(k, cos, sin)
-        y = F.scaled_dot_product_attention(q.transpose(1, 2), k.transpose(1, 2), v.transpose(1, 2), attn_mask=mask)
+        # ``mask=None`` means plain causal: ``is_causal`` lets SDPA dispatch to the FlashAttention kernel,
+        # which never materializes the L×L scores (an explicit attn_mask forces mem-efficient/math).
+        y = F.scaled_dot_product_attention(
+            q.transpose(1, 2), k.transpose(1, 2), v.transpose(1, 2), attn_mask=mask, is_causal=mask is None
+        )
         y = y.transpose(1, 2).contiguous().view(B, L, self.d_model)
         return self.c_proj(y)
 
@@ -309,13 +317,31 @@ class Block(nn.Module):
         self.attn_scale = 1 / (2 * cfg.n_layers) ** 0.5
 
     @jaxtyped(typechecker=beartype)
-    def forward(self, x: Float[Tensor, "B L d_model"], mask: Bool[Tensor, "B 1 L L"]) -> Float[Tensor, "B L d_model"]:
+    def forward(
+        self, x: Float[Tensor, "B L d_model"], mask: Bool[Tensor, "B 1 L L"] | None
+    ) -> Float[Tensor, "B L d_model"]:
         x = x + self.attn_scale * self.attn(rmsnorm(x), mask)
         x = x + self.mlp(rmsnorm(x))
         return x
 
 
 # %%
+@functools.cache
+def _positions(L: int, device: torch.device) -> Int[Tensor, " L"]:
+    """``arange(L)`` on ``device``, built once per ``(L, device)`` for the per-step pad comparisons
+    (attention mask, target validity). Shared: callers must not mutate it."""
+    return torch.arange(L, device=device)
+
+
+@functools.cache
+def _causal_mask(L: int, device: torch.device) -> tuple[Int[Tensor, " L"], Bool[Tensor, "L L"], Bool[Tensor, "L L"]]:
+    """``(positions, causal, diagonal)`` for a length-``L`` context, built once per ``(L, device)``:
+    ``L`` is fixed for a run, so only the per-sample pad term is left for ``_attn_mask`` to build.
+    Shared and read-only."""
+    idx = _positions(L, device)
+    return idx, idx[:, None] >= idx[None, :], torch.eye(L, dtype=torch.bool, device=device)
+
+
 class GPT(nn.Module):
     """Causal GPT over per-frame tokens with multi-token auxiliary heads. ``hidden[i]`` (causal) feeds
     one independent head per offset in ``cfg.head_offsets``; head ``o`` predicts the action ``o`` frames
@@ -350,51 +376,93 @@ class GPT(nn.Module):
 
         self.ctx_proj = nn.Linear(d_in, cfg.d_model)
         self.blocks = nn.ModuleList([Block(cfg) for _ in range(cfg.n_layers)])
-        # One independent joint head per future-frame offset (order matches self.head_offsets).
-        self.heads = nn.ModuleList([nn.Linear(cfg.d_model, A_VOCAB) for _ in offs])
+        # One independent joint head per future-frame offset (order matches self.head_offsets), stored as
+        # ONE fused linear with ``len(offs) * A_VOCAB`` outputs: a single matmul reads the hidden once
+        # instead of once per head. ``head_logits`` views it back to per-offset logits.
+        self.heads = nn.Linear(cfg.d_model, len(offs) * A_VOCAB)
+        self._register_load_state_dict_pre_hook(_merge_heads)
 
         # Stick/trigger center grids (registered so they move with .to() and serialize).
         self.register_buffer("main_centers", scoring.STICK_CLUSTER_CENTERS_MAIN.clone())
         self.register_buffer("c_centers", scoring.STICK_CLUSTER_CENTERS_C.clone())
         self.register_buffer("trig_centers", scoring.TRIGGER_CENTERS.clone())
 
-    def _per_player_features(self, features: dict[str, Tensor], prefix: str) -> Tensor:
-        ref = features[f"{prefix}_position_x"]
-        B, L = ref.shape
-        device = ref.device
-        parts: list[Tensor] = [features[f"{prefix}_{feat}"][..., None] for feat in FLOAT_FEATURES]
-        for feat in FLOAT_FEATURES:
-            mk = f"{prefix}_{feat}_mask"
-            parts.append(features[mk][..., None] if mk in features else torch.zeros(B, L, 1, device=device))
+    def _player_features(self, features: dict[str, Tensor]) -> Float[Tensor, "B L d_players"]:
+        """Every player's ``[float | mask | cat-embed]`` block, concatenated in ``_PLAYER_PREFIXES``
+        order. Each feature is gathered across the players first, so each categorical table runs ONE
+        lookup over ``[B, L, n_players]`` ids (not one per player) and the blocks assemble in a
+        single cat over a player axis, then flatten into the same per-player layout."""
+        no_mask = torch.zeros_like(features["ego_position_x"])
+        floats = [features[f"{p}_{feat}"] for p in _PLAYER_PREFIXES for feat in FLOAT_FEATURES]
+        masks = [features.get(f"{p}_{feat}_mask", no_mask) for p in _PLAYER_PREFIXES for feat in FLOAT_FEATURES]
+        grid = (len(_PLAYER_PREFIXES), len(FLOAT_FEATURES))
+        parts = [torch.stack(floats, dim=-1).unflatten(-1, grid), torch.stack(masks, dim=-1).unflatten(-1, grid)]
         for name, (vocab, _) in CAT_FEATURES.items():
-            parts.append(self.cat_embeds[name](features[f"{prefix}_{name}"].clamp(0, vocab - 1)))
-        return torch.cat(parts, dim=-1)
+            ids = torch.stack([features[f"{p}_{name}"] for p in _PLAYER_PREFIXES], dim=-1)
+            parts.append(self.cat_embeds[name](ids.clamp(0, vocab - 1)))  # [B, L, n_players, dim]
+        return torch.cat(parts, dim=-1).flatten(-2)
 
     def _context_tokens(self, features: dict[str, Tensor]) -> Float[Tensor, "B L_ctx d_model"]:
-        parts = [self._per_player_features(features, p) for p in _PLAYER_PREFIXES]
-        parts.append(torch.cat([features[f"ego_{ch}"][..., None] for ch in ACTION_CHANNELS], dim=-1))
-        parts.append(self.char_emb(features["ego_character"].clamp(0, self.char_emb.num_embeddings - 1)))
-        parts.append(self.char_emb(features["opp_character"].clamp(0, self.char_emb.num_embeddings - 1)))
-        parts.append(self.stage_emb(features["stage"].clamp(0, self.stage_emb.num_embeddings - 1)))
+        chars = torch.stack([features["ego_character"], features["opp_character"]], dim=-1)
+        parts = [
+            self._player_features(features),
+            torch.stack([features[f"ego_{ch}"] for ch in ACTION_CHANNELS], dim=-1),
+            self.char_emb(chars.clamp(0, self.char_emb.num_embeddings - 1)).flatten(-2),  # [ego | opp]
+            self.stage_emb(features["stage"].clamp(0, self.stage_emb.num_embeddings - 1)),
+        ]
         return self.ctx_proj(torch.cat(parts, dim=-1))
 
     def _attn_mask(self, ctx_pad: Int[Tensor, " B"], L: int, device: torch.device) -> Bool[Tensor, "B 1 L L"]:
         """Causal mask that also hides each sample's left-padded cold-start prefix (key < ctx_pad).
         A padded query keeps its diagonal so its row is never fully masked (SDPA would NaN)."""
-        idx = torch.arange(L, device=device)
-        causal = idx[:, None] >= idx[None, :]
+        idx, causal, diag = _causal_mask(L, torch.device(device))
         key_real = idx[None, :] >= ctx_pad[:, None]
-        diag = torch.eye(L, dtype=torch.bool, device=device)
         return (causal[None] & (key_real[:, None, :] | diag[None]))[:, None]
 
-    def forward(self, features: dict[str, Tensor], ctx_pad: Int[Tensor, " B"]) -> Float[Tensor, "B L_ctx d_model"]:
-        """Backbone hidden (one rmsnorm'd vector per frame); callers apply the per-offset heads."""
+    def forward(
+        self, features: dict[str, Tensor], ctx_pad: Int[Tensor, " B"], *, padded: bool = True
+    ) -> Float[Tensor, "B L_ctx d_model"]:
+        """Backbone hidden (one rmsnorm'd vector per frame); callers apply the per-offset heads.
+        ``padded`` is the host-side ``Context.padded`` flag: when no sample is padded (every
+        closed-loop replan once the buffer fills) attention runs mask-free on the flash path,
+        decided without reading ``ctx_pad`` back from the device."""
         x = self._context_tokens(features)
-        mask = self._attn_mask(ctx_pad, x.size(1), x.device)
+        mask = self._attn_mask(ctx_pad, x.size(1), x.device) if padded else None
         for block in self.blocks:
             x = block(x, mask)
         return rmsnorm(x)
 
+    def head_logits(self, h: Float[Tensor, "*batch d_model"]) -> Float[Tensor, "*batch n_offsets A_VOCAB"]:
+        """Every offset head's fp32 logits in one matmul; index ``[..., hi, :]`` by ``head_offsets`` order."""
+        return self.heads(h).unflatten(-1, (len(self.head_offsets), A_VOCAB)).float()
+
+    def primary_logits(self, h: Float[Tensor, "*batch d_model"]) -> Float[Tensor, "*batch A_VOCAB"]:
+        """The offset-1 (deployed) head alone: its row-slice of the fused weight, so decode never pays
+        for the auxiliary heads."""
+        rows = slice(self.primary_head_idx * A_VOCAB, (self.primary_head_idx + 1) * A_VOCAB)
+        return F.linear(h, self.heads.weight[rows], self.heads.bias[rows]).float()
+
+
+def _is_pre_fusion(state_dict: dict[str, Tensor]) -> bool:
+    """Whether a model state_dict still has the per-offset ``heads.{i}`` layout ``_merge_heads`` folds."""
+    return "heads.0.weight" in state_dict
+
+
+def _merge_heads(state_dict: dict[str, Tensor], prefix: str, *args) -> None:
+    """``load_state_dict`` pre-hook: stack a pre-fusion checkpoint's per-offset ``heads.{i}`` linears
+    (``ModuleList`` layout) into the fused ``heads`` linear, in ``head_offsets`` order. Exact. Only the
+    weights fold: the optimizer's param groups changed size with the fusion, so a pre-fusion run
+    resumes with fresh optimizer state (see ``train``)."""
+    n = 0
+    while f"{prefix}heads.{n}.weight" in state_dict:
+        n += 1
+    if n == 0:
+        return
+    for param in ("weight", "bias"):
+        state_dict[f"{prefix}heads.{param}"] = torch.cat(
+            [state_dict.pop(f"{prefix}heads.{i}.{param}") for i in range(n)]
+        )
+
 
 # %%
 def _quantize(model: GPT, actions: Tensor) -> Tensor:
@@ -413,37 +481,44 @@ def _multi_offset_targets(ctx: Context, target: Tensor, offsets: tuple[int, ...]
     frame; ``i >= ctx_pad`` then guarantees the target frame ``i + o`` is real too (``o >= 1``)."""
     a_full = torch.cat([stack_actions(ctx.features), target], dim=1)  # [B, L_ctx + max_off, A_DIM]
     L_ctx = a_full.size(1) - target.size(1)
-    pos = torch.arange(L_ctx, device=a_full.device)
+    pos = _positions(L_ctx, a_full.device)
     valid = pos[None, :] >= ctx.ctx_pad[:, None]  # [B, L_ctx], shared by all offsets
     targets = {o: a_full[:, o : o + L_ctx] for o in offsets}  # each [B, L_ctx, A_DIM]
     return targets, valid
 
 
-def group_nll(logits: Tensor, tgt_idx: Tensor, valid: Tensor) -> dict[str, Tensor]:
-    """Per-group categorical NLL (nats) over the VALID positions only. Returns ``{name: [n_valid]}``
-    1D tensors (same ordering across groups) so callers reduce once for exact sample weighting."""
-    flat_valid = valid.reshape(-1)
+def group_nll(logits: Tensor, tgt_idx: Tensor) -> dict[str, Tensor]:
+    """Per-group categorical NLL (nats). ``logits [N, *, A_VOCAB]``, ``tgt_idx [N, *, N_GROUPS]`` over rows the
+    caller already restricted to VALID positions: each group is ONE index-target cross-entropy over its slice
+    for every trailing (e.g. offset) row at once. Returns ``{name: [N, *]}`` (same ordering across groups) so
+    callers reduce once for exact sample weighting."""
     out: dict[str, Tensor] = {}
     for g, name in enumerate(_GROUP_NAMES):
-        lo = _GROUP_OFFSETS[g]
-        lg = logits[..., lo : lo + _GROUP_VOCABS[g]].reshape(-1, _GROUP_VOCABS[g])[flat_valid]
-        out[name] = F.cross_entropy(lg, tgt_idx[..., g].reshape(-1)[flat_valid], reduction="none")
+        lo, v = _GROUP_OFFSETS[g], _GROUP_VOCABS[g]
+        lg = logits[..., lo : lo + v].reshape(-1, v)
+        nats = F.cross_entropy(lg, tgt_idx[..., g].reshape(-1), reduction="none")
+        out[name] = nats.reshape(tgt_idx.shape[:-1])
     return out
 
 
+def _offset_targets_idx(
+    model: GPT, targets: dict[int, Tensor], valid: Tensor
+) -> Int[Tensor, "n_valid n_offsets n_groups"]:
+    """Every head offset's target classes at the valid positions, in one quantize, stacked in
+    ``model.head_offsets`` order."""
+    return _quantize(model, torch.stack([targets[o] for o in model.head_offsets], dim=2)[valid])
+
+
 def action_loss(model: GPT, batch: TrainBatch) -> dict[tuple[int, str], Tensor]:
     """Dense multi-token NLL: every valid context position predicts the action at each head offset.
-    Keyed by ``(offset, group_name)`` → ``[n_valid]`` nats; one shared backbone forward, one head each."""
+    Keyed by ``(offset, group_name)`` → ``[n_valid]`` nats; one shared backbone forward, then every offset
+    head as ONE matmul over just the valid positions' hidden rows (pad rows never reach the heads)."""
     ctx = batch.context
-    h = model(ctx.features, ctx.ctx_pad)  # [B, L_ctx, d_model]
+    h = model(ctx.features, ctx.ctx_pad, padded=ctx.padded)  # [B, L_ctx, d_model]
     targets, valid = _multi_offset_targets(ctx, batch.target, model.head_offsets)
-    comps: dict[tuple[int, str], Tensor] = {}
-    for hi, o in enumerate(model.head_offsets):
-        logits = model.heads[hi](h).float()  # [B, L_ctx, A_VOCAB]
-        tgt_idx = _quantize(model, targets[o])
-        for name, c in group_nll(logits, tgt_idx, valid).items():
-            comps[(o, name)] = c
-    return comps
+    logits = model.head_logits(h[valid])  # [n_valid, n_offsets, A_VOCAB]
+    nll = group_nll(logits, _offset_targets_idx(model, targets, valid))  # {name: [n_valid, n_offsets]}
+    return {(o, name): nll[name][:, hi] for hi, o in enumerate(model.head_offsets) for name in _GROUP_NAMES}
 
 
 @torch.no_grad()
@@ -453,20 +528,28 @@ def decode(
     """One next-frame action per sample from the LAST context position, in raw action ranges, via the
     offset-1 (primary) head only. Each group's logit slice is sampled (``temp``-scaled softmax) or taken
     greedily (``argmax``, for the recon metric) independently."""
-    h = model(ctx.features, ctx.ctx_pad)[:, -1]  # [B, d_model]
-    logits = model.heads[model.primary_head_idx](h).float()  # [B, A_VOCAB]
-    picks: list[Tensor] = []
-    for g in range(N_GROUPS):
-        lo = _GROUP_OFFSETS[g]
-        lg = logits[:, lo : lo + _GROUP_VOCABS[g]]
-        if argmax:
-            picks.append(lg.argmax(-1))
-        else:
-            picks.append(torch.multinomial(F.softmax(lg / temp, dim=-1), 1, generator=gen).squeeze(-1))
+    h = model(ctx.features, ctx.ctx_pad, padded=ctx.padded)[:, -1]  # [B, d_model]
+    logits = model.primary_logits(h)  # [B, A_VOCAB]
+    if not argmax:
+        # One Gumbel perturbation of the joint vector: each group's slice argmax is then a sample
+        # from that group's temp-scaled softmax.
+        logits = scoring.gumbel_perturb(logits, temp=temp, gen=gen)
+    picks = [logits[:, lo : lo + v].argmax(-1) for lo, v in zip(_GROUP_OFFSETS, _GROUP_VOCABS, strict=True)]
     idx = torch.stack(picks, dim=-1)  # [B, N_GROUPS]
     return _dequantize(model, idx)[:, None, :]
 
 
+def _autocast(cfg: TrainConfig, device: str) -> contextlib.AbstractContextManager:
+    """The ``cfg.amp_dtype`` autocast context for ``device`` — bf16 on CUDA, else a no-op. Shared by the
+    training step, val metrics and closed-loop decode so all three run the trunk at the same precision;
+    the heads hand fp32 logits to every loss / sampler regardless."""
+    if cfg.amp_dtype not in ("bfloat16", "float32"):
+        raise ValueError(f"amp_dtype must be 'bfloat16' or 'float32', got {cfg.amp_dtype!r}")
+    if cfg.amp_dtype == "bfloat16" and torch.device(device).type == "cuda":
+        return torch.autocast("cuda", dtype=torch.bfloat16)
+    return contextlib.nullcontext()
+
+
 def make_policy(
     model: GPT,
     stats: dict[str, FeatureStats],
@@ -481,7 +564,8 @@ def make_policy(
     @torch.no_grad()
     def predict_chunk(ctx: Context, committed: np.ndarray | None) -> np.ndarray:
         assert committed is None, "next-token policy does not condition on a committed prefix"
-        return decode(model, ctx, temp=temp).cpu().numpy()
+        with _autocast(cfg, device):
+            return decode(model, ctx, temp=temp).cpu().numpy()
 
     return RecedingHorizon(
         predict_chunk=predict_chunk, stats=stats, L_ctx=cfg.L_ctx, L_chunk=CLOSED_LOOP_L_CHUNK, s=1, d=0, device=device
@@ -567,20 +651,20 @@ def val_metrics(model: GPT, val_cache: list[TrainBatch], cfg: TrainConfig) -> di
     multipress: list[Tensor] = []
     for batch in val_cache:
         ctx = batch.context
-        h = model(ctx.features, ctx.ctx_pad)
+        h = model(ctx.features, ctx.ctx_pad, padded=ctx.padded)
         targets, valid = _multi_offset_targets(ctx, batch.target, model.head_offsets)
-        flat_valid = valid.reshape(-1)
+        logits = model.head_logits(h[valid])  # [n_valid, n_offsets, A_VOCAB]
+        idx = _offset_targets_idx(model, targets, valid)  # [n_valid, n_offsets, N_GROUPS]
+        nll = group_nll(logits, idx)
         for hi, o in enumerate(model.head_offsets):
-            logits = model.heads[hi](h).float()
-            tgt_idx = _quantize(model, targets[o])
-            for name, c in group_nll(logits, tgt_idx, valid).items():
-                comps_cat.setdefault((o, name), []).append(c)
-            if o == 1:  # deployed head drives the button proper-scoring stats
-                btn_logits = logits[..., : scoring.N_BUTTON_COMBOS].reshape(-1, scoring.N_BUTTON_COMBOS)[flat_valid]
-                btn_probs.append(scoring.combo_marginal_probs(btn_logits))
-                tgt_btn = _dequantize(model, tgt_idx)[..., _N_CONT:].reshape(-1, _N_BUTTONS)[flat_valid]
-                btn_tgts.append(tgt_btn)
-                multipress.append((tgt_btn > 0.5).sum(-1) >= 2)
+            for name in _GROUP_NAMES:
+                comps_cat.setdefault((o, name), []).append(nll[name][:, hi])
+        # The deployed (offset-1) head drives the button proper-scoring stats.
+        pi = model.primary_head_idx
+        btn_probs.append(scoring.combo_marginal_probs(logits[:, pi, : scoring.N_BUTTON_COMBOS]))
+        tgt_btn = _dequantize(model, idx[:, pi])[..., _N_CONT:]
+        btn_tgts.append(tgt_btn)
+        multipress.append((tgt_btn > 0.5).sum(-1) >= 2)
     comps = {k: torch.cat(v) for k, v in comps_cat.items()}
     primary = nll_breakdown({name: comps[(1, name)] for name in _GROUP_NAMES})
     logloss, brier = scoring.bernoulli_scores_from_probs(torch.cat(btn_probs), torch.cat(btn_tgts))
@@ -609,21 +693,21 @@ def recon_metrics(
     Buttons → acc + F1 @ decode; continuous → MAE. ``argmax`` is the deterministic controller proxy."""
     was_training = model.training
     model.eval()
-    tp = fp = fn = btn_correct = btn_total = 0
-    cont_abs_err = 0.0
-    cont_count = 0
+    # Per-batch sums accumulate on the device and cross to the host in one transfer at the end,
+    # not a sync per statistic per batch.
+    sums: list[Tensor] = []
+    btn_total = cont_count = 0
     for batch in val_cache:
         pred = decode(model, batch.context, temp=temp, argmax=argmax, gen=gen)
         tgt = batch.target
         pb = pred[..., _N_CONT:] > 0.5
         tb = tgt[..., _N_CONT:] > 0.5
-        tp += int((pb & tb).sum())
-        fp += int((pb & ~tb).sum())
-        fn += int((~pb & tb).sum())
-        btn_correct += int((pb == tb).sum())
+        err = (pred[..., :_N_CONT] - tgt[..., :_N_CONT]).abs().sum()
+        counts = torch.stack([(pb & tb).sum(), (pb & ~tb).sum(), (~pb & tb).sum(), (pb == tb).sum()])
+        sums.append(torch.cat([counts.double(), err.double()[None]]))
         btn_total += pb.numel()
-        cont_abs_err += float((pred[..., :_N_CONT] - tgt[..., :_N_CONT]).abs().sum())
         cont_count += tgt[..., :_N_CONT].numel()
+    tp, fp, fn, btn_correct, cont_abs_err = torch.stack(sums).sum(0).tolist()
     if was_training:
         model.train()
     prec = tp / (tp + fp) if tp + fp else 0.0
@@ -685,13 +769,7 @@ def train(
 
     torch.manual_seed(cfg.seed)
     torch.set_float32_matmul_precision("high" if cfg.allow_tf32 else "highest")
-    if cfg.amp_dtype not in ("bfloat16", "float32"):
-        raise ValueError(f"amp_dtype must be 'bfloat16' or 'float32', got {cfg.amp_dtype!r}")
-    autocast = (
-        torch.autocast(DEVICE, dtype=torch.bfloat16)
-        if cfg.amp_dtype == "bfloat16" and DEVICE == "cuda"
-        else contextlib.nullcontext()
-    )
+    autocast = _autocast(cfg, DEVICE)
     start_step = resume_state["step"] + 1 if resume_state else 0
     model = GPT(cfg).to(DEVICE)
     n_params = sum(p.numel() for p in model.parameters())
@@ -717,12 +795,21 @@ def train(
         **loader_kwargs,
     )
     val_loader = make_loader(split=cfg.val_split, num_workers=0, **loader_kwargs)
+    # Spawn the train workers now: they fill their prefetch ring while the val set and the rest of
+    # setup build below, so step 0 starts on batches already preprocessed instead of a cold pipeline.
+    first_epoch = iter(train_loader)
 
     opt = make_optimizer(model, cfg)
     sched = LambdaLR(opt, lr_schedule(cfg))
     if resume_state is not None:
+        legacy_heads = _is_pre_fusion(resume_state["model"])
         model.load_state_dict(resume_state["model"])
-        opt.load_state_dict(resume_state["opt"])
+        if legacy_heads:
+            # Per-offset head params were separate optimizer entries before the fusion; their AdamW
+            # moments don't map onto the fused layout's param groups, so restart the optimizer.
+            print(f"[resume] {run_name}: pre-fusion heads checkpoint, optimizer state NOT restored", flush=True)
+        else:
+            opt.load_state_dict(resume_state["opt"])
         sched.load_state_dict(resume_state["sched"])
         print(f"[resume] {run_name}: continuing from step {start_step}", flush=True)
 
@@ -751,10 +838,11 @@ def train(
 
     def _val_log_dict() -> dict[str, float]:
         """Flat ``val/*`` metric dict (one W&B section). Merged into the per-step log; no wandb.log here."""
-        vm = val_metrics(model, val_cache, cfg)
-        gen = torch.Generator(device=DEVICE).manual_seed(0)
-        recon = {"argmax": recon_metrics(model, val_cache, argmax=True)}
-        recon["sample"] = recon_metrics(model, val_cache, argmax=False, temp=cfg.decode_temp, gen=gen)
+        with _autocast(cfg, DEVICE):
+            vm = val_metrics(model, val_cache, cfg)
+            gen = torch.Generator(device=DEVICE).manual_seed(0)
+            recon = {"argmax": recon_metrics(model, val_cache, argmax=True)}
+            recon["sample"] = recon_metrics(model, val_cache, argmax=False, temp=cfg.decode_temp, gen=gen)
         out = {f"val/{k}": v for k, v in vm.items()}
         for tag, rm in recon.items():
             out[f"val/recon_{tag}_acc"] = rm["recon_button_acc"]
@@ -857,18 +945,18 @@ def train(
         print(f"[t+{time.monotonic() - run_t0:.0f}s] step {step}: launched async eval (pid {proc.pid})", flush=True)
 
     model.train()
-    it = iter(train_loader)
+    # Endless over epochs (persistent workers carry the epoch counter), starting with the epoch
+    # already in flight; each batch arrives on the device with the next one's copy already queued.
+    it = prefetch_to_device(
+        itertools.chain(first_epoch, itertools.chain.from_iterable(itertools.repeat(train_loader))), DEVICE
+    )
     run_t0 = time.monotonic()
     for step in range(start_step, cfg.max_steps):
         with profile("step") as sw:
             opt.zero_grad()
             comps_acc: dict[tuple[int, str], list[Tensor]] = {}
             for _ in range(cfg.grad_accum_steps):
-                try:
-                    batch = next(it).to(DEVICE)
-                except StopIteration:
-                    it = iter(train_loader)
-                    batch = next(it).to(DEVICE)
+                batch = next(it)
                 with autocast:
                     comps = action_loss(model, batch)
                     loss = objective(comps, cfg.aux_loss_weight) / cfg.grad_accum_steps
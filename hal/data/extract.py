@@ -44,10 +44,17 @@ def _arr_to_np(arr: Any, dtype: DTypeLike, length: int) -> np.ndarray:
     None whole-column means peppi didn't parse this field for this slp
     version — fill with the dtype's mask sentinel. None scalars within a
     column (e.g. peppi.hitlag for one frame) get the same treatment.
+
+    Null-free columns (nearly all of them) are read straight off the Arrow
+    buffer; only columns with null scalars take the per-element list path.
+    The result may be a read-only view of that buffer — callers index it by
+    ``keep_idx``, which copies.
     """
     mask = mask_value(dtype)
     if arr is None:
         return np.full(length, mask, dtype=dtype)
+    if arr.null_count == 0:
+        return arr.to_numpy(zero_copy_only=False).astype(dtype, copy=False)
     return _list_to_np(arr.to_pylist(), dtype, length)
 
 
@@ -88,7 +95,10 @@ def _gamestate_arrays(post: Post, key_prefix: str, keep_idx: np.ndarray, length:
 def _unpack_buttons(physical: Any, length: int) -> dict[str, np.ndarray]:
     if physical is None:
         return {b: np.zeros(length, dtype=np.int32) for b in BUTTON_BITS}
-    bits = np.array([v if v is not None else 0 for v in physical.to_pylist()], dtype=np.int32)
+    if physical.null_count == 0:
+        bits = physical.to_numpy(zero_copy_only=False).astype(np.int32)
+    else:
+        bits = np.array([v if v is not None else 0 for v in physical.to_pylist()], dtype=np.int32)
     return {b: ((bits & mask) != 0).astype(np.int32) for b, mask in BUTTON_BITS.items()}
 
 
@@ -40,6 +40,7 @@ from hal.training.dataloader import relabel_ego
 from hal.training.features import ACTION_CHANNELS
 from hal.training.features import NEUTRAL_ACTION
 from hal.training.features import Context
+from hal.training.features import PreprocessPlan
 from hal.training.features import action_vec_to_controller
 from hal.training.features import preprocess
 
@@ -133,8 +134,12 @@ class RecedingHorizon:
     _slots: dict[Slot, _SlotState] = field(default_factory=dict)
     _offset: int = 0
     _bootstrapped: bool = False
+    _plan: PreprocessPlan = field(init=False)
+    _pinned: dict[str, torch.Tensor] = field(default_factory=dict)
+    _stacked: dict[str, np.ndarray] = field(default_factory=dict)
 
     def __post_init__(self) -> None:
+        self._plan = PreprocessPlan(self.stats)
         if not 0 < self.s <= self.L_chunk:
             raise ValueError(f"execution horizon s={self.s} must satisfy 0 < s <= L_chunk={self.L_chunk}")
         if not 0 <= self.d <= self.L_chunk - self.s:
@@ -173,19 +178,29 @@ class RecedingHorizon:
         """One batched forward over every live slot. ``live`` order is fixed by
         the caller and reused to scatter the per-slot chunks back."""
         stacked = self._build_stacked_batch(live)
-        feats = {k: v.to(self.device) for k, v in preprocess(stacked, self.stats).items()}
+        feats = {k: self._h2d(k, v) for k, v in preprocess(stacked, self._plan).items()}
         # Hide each slot's still-empty buffer prefix from attention (frames
         # 0..L_ctx fill from empty); 0 once a slot's history reaches L_ctx.
-        ctx_pad = torch.tensor(
-            [max(0, self.L_ctx - len(self._slots[sl].flat_hist)) for sl in live],
-            dtype=torch.long,
-            device=self.device,
-        )
+        pads = [max(0, self.L_ctx - len(self._slots[sl].flat_hist)) for sl in live]
+        ctx_pad = self._h2d("ctx_pad", torch.tensor(pads, dtype=torch.long))
         committed = self._committed(live)
-        plans = self.predict_chunk(Context(features=feats, ctx_pad=ctx_pad), committed)
+        plans = self.predict_chunk(Context(features=feats, ctx_pad=ctx_pad, padded=any(pads)), committed)
         for i, sl in enumerate(live):
             self._slots[sl].pending = plans[i]
 
+    def _h2d(self, name: str, x: torch.Tensor) -> torch.Tensor:
+        """Host→device copy staged through a page-locked buffer kept per feature, so the copy is
+        async (``non_blocking``) without pinning fresh memory every replan. A buffer is reallocated
+        only when its shape changes (a slot dropped out). Reuse is safe: ``predict_chunk`` returns
+        host arrays, which synchronizes before the next replan overwrites the buffer."""
+        if torch.device(self.device).type != "cuda":
+            return x.to(self.device)
+        buf = self._pinned.get(name)
+        if buf is None or buf.shape != x.shape or buf.dtype != x.dtype:
+            buf = self._pinned[name] = torch.empty(x.shape, dtype=x.dtype, pin_memory=True)
+        buf.copy_(x)
+        return buf.to(self.device, non_blocking=True)
+
     def _committed(self, live: list[Slot]) -> np.ndarray | None:
         """The ``d`` already-committed actions each new chunk is conditioned on:
         the previous chunk's actions for the new chunk's prefix frames (its
@@ -196,13 +211,23 @@ class RecedingHorizon:
         return np.stack([self._slots[sl].pending[self.s : self.s + self.d].astype(np.float32) for sl in live], axis=0)
 
     def _build_stacked_batch(self, live: list[Slot]) -> dict[str, np.ndarray]:
-        per_slot = [
-            _live_batch_from_rolling(
+        """Each slot's ``[1, L_ctx]`` rows written straight into per-feature ``[n_live, L_ctx]`` host
+        buffers reused across replans (reallocated only when a slot drops out), rather than a
+        concatenate allocating every column afresh. Reuse is safe: ``preprocess`` copies its inputs."""
+        out: dict[str, np.ndarray] = {}
+        for i, sl in enumerate(live):
+            row = _live_batch_from_rolling(
                 self._slots[sl].flat_hist,
                 self._slots[sl].ego_inputs_hist,
                 ego_prefix=_PORT_TO_PREFIX[sl.port],
                 L_ctx=self.L_ctx,
             )
-            for sl in live
-        ]
-        return {k: np.concatenate([d[k] for d in per_slot], axis=0) for k in per_slot[0]}
+            for k, v in row.items():
+                if i == 0:
+                    buf = self._stacked.get(k)
+                    shape = (len(live),) + v.shape[1:]
+                    if buf is None or buf.shape != shape or buf.dtype != v.dtype:
+                        buf = self._stacked[k] = np.empty(shape, dtype=v.dtype)
+                    out[k] = buf
+                out[k][i] = v[0]
+        return out
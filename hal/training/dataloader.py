@@ -9,6 +9,7 @@ rather than on the training hot path.
 """
 
 import functools
+from collections.abc import Iterable
 from collections.abc import Iterator
 from pathlib import Path
 
@@ -22,23 +23,32 @@ from torch.utils.data import get_worker_info
 from hal.data.schema import check_schema_version
 from hal.data.stats import FeatureStats
 from hal.training.features import Context
+from hal.training.features import PreprocessPlan
 from hal.training.features import TrainBatch
 from hal.training.features import preprocess
 from hal.training.features import stack_actions
+from hal.training.features import to_wire
 
 
 def relabel_ego(window: dict[str, np.ndarray], ego_prefix: str) -> dict[str, np.ndarray]:
     """Rename p1_*/p2_* keys to ego_*/opp_* based on `ego_prefix`."""
+    return dict(zip(_relabeled_keys(tuple(window), ego_prefix), window.values(), strict=True))
+
+
+@functools.cache
+def _relabeled_keys(keys: tuple[str, ...], ego_prefix: str) -> tuple[str, ...]:
+    # Every window of a dataset shares one column set, so the renamed keys are built once per
+    # (column set, ego port) instead of re-formatting every key string per window.
     opp_prefix = "p2" if ego_prefix == "p1" else "p1"
-    rel: dict[str, np.ndarray] = {}
-    for k, v in window.items():
+    out: list[str] = []
+    for k in keys:
         if k.startswith(f"{ego_prefix}_"):
-            rel[f"ego_{k[3:]}"] = v
+            out.append(f"ego_{k[3:]}")
         elif k.startswith(f"{opp_prefix}_"):
-            rel[f"opp_{k[3:]}"] = v
+            out.append(f"opp_{k[3:]}")
         else:
-            rel[k] = v
-    return rel
+            out.append(k)
+    return tuple(out)
 
 
 def _choose_chunk_starts(T: int, L_ctx: int, L_chunk: int, K: int, rng: np.random.Generator) -> np.ndarray:
@@ -129,14 +139,15 @@ class WindowDataset(IterableDataset):
         Real frames ``[max(0,start), start+_L)`` come from ``sample``; the ``pad``
         missing front frames are zero-filled (hidden via ``ctx_pad`` downstream)."""
         stop = start + self._L
+        if pad == 0:
+            # The common case: every column is a zero-copy view (collate does the one real copy).
+            return {k: v[start:stop] for k, v in sample.items()}
         out: dict[str, np.ndarray] = {}
         for k, v in sample.items():
-            real = v[max(0, start) : stop]
-            if pad > 0:
-                front = np.zeros((pad, *v.shape[1:]), dtype=v.dtype)
-                out[k] = np.concatenate([front, real], axis=0)
-            else:
-                out[k] = real
+            # One zeroed allocation per column, real frames written into its tail.
+            win = np.zeros((self._L, *v.shape[1:]), dtype=v.dtype)
+            win[pad:] = v[:stop]
+            out[k] = win
         return out
 
 
@@ -146,7 +157,7 @@ def collate_windows(batch: list[dict]) -> dict[str, np.ndarray]:
     return {k: np.stack([s[k] for s in batch]) for k in keys}
 
 
-def collate_train_batch(batch: list[dict], *, stats: dict[str, FeatureStats], L_ctx: int) -> TrainBatch:
+def collate_train_batch(batch: list[dict], *, plan: PreprocessPlan, L_ctx: int) -> TrainBatch:
     """Worker-side collate: stack → ``preprocess`` → split ``[ctx | chunk]``.
 
     The window the sampler yields is laid out ``[ctx | chunk]`` over
@@ -154,14 +165,17 @@ def collate_train_batch(batch: list[dict], *, stats: dict[str, FeatureStats], L_
     frames; the target action chunk is the remaining frames sliced off the
     stacked ego-action channels at ``[L_ctx :]``. Returns a fully-tensorized
     ``TrainBatch`` so the training loop does no reshaping — just ``.to(device)``.
+    Categorical ids travel as int32 and button channels (exact 0/1) as uint8; both
+    are widened on the device by ``Context.to``, shrinking the host→device copy.
     """
     stacked = collate_windows(batch)
     ctx_pad = torch.from_numpy(stacked["ctx_pad"].astype(np.int64))
-    feats = preprocess(stacked, stats)
+    feats = preprocess(stacked, plan)
     actions = stack_actions(feats)
-    context_features = {k: v[:, :L_ctx] for k, v in feats.items()}
+    context_features = {k: to_wire(k, v[:, :L_ctx]) for k, v in feats.items()}
     target = actions[:, L_ctx:]
-    return TrainBatch(Context(features=context_features, ctx_pad=ctx_pad), target=target)
+    context = Context(features=context_features, ctx_pad=ctx_pad, padded=bool(stacked["ctx_pad"].any()))
+    return TrainBatch(context, target=target)
 
 
 def make_loader(
@@ -227,7 +241,8 @@ def make_loader(
         predownload=predownload,
     )
     sampler = WindowDataset(mds, L_ctx, L_chunk, seed=seed, windows_per_replay=windows_per_replay)
-    collate = functools.partial(collate_train_batch, stats=stats, L_ctx=L_ctx)
+    # Stats compile into a plan once here; each worker gets its own copy with the partial.
+    collate = functools.partial(collate_train_batch, plan=PreprocessPlan(stats), L_ctx=L_ctx)
     # Pin by default only when there's a GPU to copy to (page-locking host memory is
     # wasted on a CPU run). ``TrainBatch.pin_memory`` makes the custom batch poolable.
     if pin_memory is None:
@@ -250,3 +265,34 @@ def make_loader(
         prefetch_factor=prefetch_factor if num_workers > 0 else None,
         pin_memory=pin_memory,
     )
+
+
+def prefetch_to_device(batches: Iterable[TrainBatch], device: str | torch.device) -> Iterator[TrainBatch]:
+    """Yield ``batches`` moved to ``device`` with the NEXT batch's host→device copy already in
+    flight. On CUDA the copies run on a side stream, so they overlap the compute queued on the
+    current stream for the batch being trained on (a ``non_blocking`` copy on the compute stream
+    would still serialize behind it); the current stream waits on the copy only when the batch is
+    handed out. Pinned host batches (``make_loader(pin_memory=True)``) are what make the copies
+    async. Elsewhere this is a plain ``.to(device)`` per batch."""
+    device = torch.device(device)
+    if device.type != "cuda":
+        for b in batches:
+            yield b.to(device)
+        return
+    copy_stream = torch.cuda.Stream(device)
+    it = iter(batches)
+
+    def stage() -> TrainBatch | None:
+        b = next(it, None)
+        if b is None:
+            return None
+        with torch.cuda.stream(copy_stream):
+            return b.to(device)
+
+    nxt = stage()
+    while nxt is not None:
+        compute = torch.cuda.current_stream(device)
+        compute.wait_stream(copy_stream)
+        nxt.record_stream(compute)
+        cur, nxt = nxt, stage()
+        yield cur
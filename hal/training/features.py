@@ -22,6 +22,7 @@ Tensor-dim names (docstrings):
 """
 
 from dataclasses import dataclass
+from dataclasses import field
 
 import numpy as np
 import torch
@@ -97,6 +98,28 @@ _STICK_TRIGGER_SUFFIXES = (
 
 
 # %%
+# Wire → compute dtypes. The train collate ships categorical ids as int32 (half the host→device
+# bytes of int64) and 0/1 button channels as uint8 (a quarter of float32); ``Context.to`` widens
+# them back on the destination device, so models only ever see the documented dtypes.
+_WIDEN: dict[torch.dtype, torch.dtype] = {torch.int32: torch.int64, torch.uint8: torch.float32}
+
+
+def _widen(v: Tensor) -> Tensor:
+    dtype = _WIDEN.get(v.dtype)
+    return v if dtype is None else v.to(dtype)
+
+
+def to_wire(name: str, v: Tensor) -> Tensor:
+    """Narrowest exact dtype for one ``preprocess`` output column's host→device copy: int64
+    categorical ids → int32, button channels (routed by the same :func:`_classify` that made them
+    exact 0/1) → uint8. ``Context.to`` / ``Context.widen`` undo it."""
+    if v.dtype == torch.int64:
+        return v.to(torch.int32)
+    if _classify(name) == "button":
+        return v.to(torch.uint8)
+    return v
+
+
 @dataclass(frozen=True, slots=True)
 class Context:
     """The observed gamestate the model conditions on. Built identically by the
@@ -104,10 +127,15 @@ class Context:
     which.
 
     ``features`` carries per-feature columns at length ``L_ctx`` (normalized
-    floats + their mask sidecars + int64 categorical ids + raw stick/trigger/
+    floats + their mask sidecars + int64 categorical ids + float32 stick/trigger/
     button channels, including the ego's own controller history). ``ctx_pad``
     hides each sample's not-yet-filled leftmost context positions from attention.
 
+    Batches straight off the train loader are in the narrower wire dtypes
+    (int32 ids, uint8 buttons; see ``_WIDEN``). ``to`` restores the dtypes above
+    on the destination device; a consumer reading a raw CPU batch without moving
+    it calls ``widen`` first.
+
     Deliberately neutral: any already-committed action prefix an RTC experiment
     conditions on is part of the predicted chunk (at train) or supplied to the
     inference integrator (at eval), not carried here.
@@ -115,15 +143,26 @@ class Context:
 
     features: dict[str, Tensor]
     ctx_pad: Tensor  # [B] int64
+    # Host-side ``bool(ctx_pad.any())``, set where ctx_pad is built on the CPU so a model can skip
+    # its padding mask without a device sync. True (always mask) when the builder doesn't know.
+    padded: bool = True
 
     @property
     def batch(self) -> int:
         return next(iter(self.features.values())).shape[0]
 
+    def widen(self) -> Context:
+        """The same context with wire-narrowed features back in their compute dtypes, in place on
+        their current device. Already-wide columns pass through unchanged."""
+        return Context(
+            features={k: _widen(v) for k, v in self.features.items()}, ctx_pad=self.ctx_pad, padded=self.padded
+        )
+
     def to(self, device: str | torch.device) -> Context:
         return Context(
-            features={k: v.to(device, non_blocking=True) for k, v in self.features.items()},
+            features={k: _widen(v.to(device, non_blocking=True)) for k, v in self.features.items()},
             ctx_pad=self.ctx_pad.to(device, non_blocking=True),
+            padded=self.padded,
         )
 
     def pin_memory(self) -> Context:
@@ -133,8 +172,16 @@ class Context:
         return Context(
             features={k: v.pin_memory() for k, v in self.features.items()},
             ctx_pad=self.ctx_pad.pin_memory(),
+            padded=self.padded,
         )
 
+    def record_stream(self, stream: torch.cuda.Stream) -> None:
+        # Mark device tensors copied on a side stream as in use by ``stream`` so the caching
+        # allocator can't recycle them while work queued there still reads them.
+        for v in self.features.values():
+            v.record_stream(stream)
+        self.ctx_pad.record_stream(stream)
+
 
 @dataclass(frozen=True, slots=True)
 class TrainBatch:
@@ -149,6 +196,10 @@ class TrainBatch:
     def pin_memory(self) -> TrainBatch:
         return TrainBatch(context=self.context.pin_memory(), target=self.target.pin_memory())
 
+    def record_stream(self, stream: torch.cuda.Stream) -> None:
+        self.context.record_stream(stream)
+        self.target.record_stream(stream)
+
 
 # %%
 def _classify(name: str) -> str:
@@ -175,22 +226,107 @@ def _is_masked(arr: np.ndarray) -> np.ndarray:
     return arr == mask_value(arr.dtype)
 
 
-def _normalize(arr: np.ndarray, s: FeatureStats) -> np.ndarray:
-    if s.max == s.min:
-        return np.zeros_like(arr, dtype=np.float32)
-    return (2.0 * (arr - s.min) / (s.max - s.min) - 1.0).astype(np.float32)
+def _float_affine(name: str, s: FeatureStats) -> tuple[float, float]:
+    """``(shift, inv_scale)`` such that ``(x - shift) * inv_scale`` normalizes ``name``.
+
+    percent + position are heavy-tailed: their dataset max (percent ~507, off the
+    0-160 decision range) squashes min-max into a sliver, so they standardize;
+    everything else min-max normalizes to [-1, 1]. A degenerate stat (zero std or
+    max == min) maps the feature to zeros via ``inv_scale = 0``."""
+    if "position" in name or "percent" in name:
+        return s.mean, (1.0 / s.std if s.std != 0 else 0.0)
+    half = (s.max - s.min) / 2.0
+    return s.min + half, (1.0 / half if half != 0 else 0.0)
+
+
+@dataclass(frozen=True, slots=True)
+class _Layout:
+    """One batch column set's routing, compiled once: the kept columns by kind, the float mask
+    sidecar names, and the floats' stacked normalization."""
+
+    controller_groups: tuple[tuple[str, ...], ...]  # sticks / triggers / buttons by source dtype; native range
+    cat_groups: tuple[tuple[str, ...], ...]  # categoricals by source dtype
+    float_names: tuple[str, ...]
+    mask_names: tuple[str, ...]  # f"{float_name}_mask", aligned with float_names
+    shift: np.ndarray  # [F] float32
+    inv_scale: np.ndarray  # [F] float32
+
+
+@dataclass(frozen=True, slots=True)
+class PreprocessPlan:
+    """``FeatureStats`` compiled into the routing + stacked arrays :func:`preprocess` applies.
+
+    Build once per loader / policy. The column set is only known from the first
+    batch, so each distinct column tuple is classified and compiles its ``[F]``
+    shift / inverse-scale vectors on first sight; every later batch with the same
+    columns reuses them — no per-feature classification, key formatting or stats
+    lookups on the per-batch path. Layouts are keyed on the column names AND
+    dtypes: the same-dtype stacking groups are read off the batch that compiled
+    them, and a batch whose dtypes differ must not reuse them (``np.stack`` would
+    promote a narrower column and its integer mask sentinel would stop matching).
+    """
+
+    stats: dict[str, FeatureStats]
+    _layouts: dict[tuple[tuple[str, np.dtype], ...], _Layout] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def layout(self, batch: dict[str, np.ndarray]) -> _Layout:
+        key = tuple((n, v.dtype) for n, v in batch.items())
+        lay = self._layouts.get(key)
+        if lay is None:
+            lay = self._layouts[key] = self._compile(batch)
+        return lay
+
+    def _compile(self, batch: dict[str, np.ndarray]) -> _Layout:
+        names = tuple(batch)
+        controller: list[str] = []
+        cats: list[str] = []
+        floats: list[str] = []
+        for n in names:
+            kind = _classify(n)
+            if kind == "button" or kind == "stick_trigger":
+                controller.append(n)
+            elif kind == "cat":
+                cats.append(n)
+            elif kind == "float":
+                floats.append(n)
+            elif kind != "drop":
+                raise AssertionError(f"unhandled kind {kind} for {n}")
+        affine = np.array(
+            [_float_affine(n, self.stats[consolidate_key(n)]) for n in floats], dtype=np.float32
+        ).reshape(len(floats), 2)
+        return _Layout(
+            controller_groups=_by_dtype(controller, batch),
+            cat_groups=_by_dtype(cats, batch),
+            float_names=tuple(floats),
+            mask_names=tuple(f"{n}_mask" for n in floats),
+            shift=np.ascontiguousarray(affine[:, 0]),
+            inv_scale=np.ascontiguousarray(affine[:, 1]),
+        )
 
 
-def _standardize(arr: np.ndarray, s: FeatureStats) -> np.ndarray:
-    if s.std == 0:
-        return np.zeros_like(arr, dtype=np.float32)
-    return ((arr - s.mean) / s.std).astype(np.float32)
+def _by_dtype(names: list[str], batch: dict[str, np.ndarray]) -> tuple[tuple[str, ...], ...]:
+    """``names`` split into same-dtype groups (first-seen order), so each group stacks without a
+    cast that would lose its integer mask sentinel."""
+    groups: dict[np.dtype, list[str]] = {}
+    for n in names:
+        groups.setdefault(batch[n].dtype, []).append(n)
+    return tuple(tuple(g) for g in groups.values())
 
 
-def preprocess(
-    batch: dict[str, np.ndarray],
-    feature_stats: dict[str, FeatureStats],
-) -> dict[str, Tensor]:
+def _sanitize_stacked(
+    batch: dict[str, np.ndarray], groups: tuple[tuple[str, ...], ...], fill: float, dtype: type, out: dict[str, Tensor]
+) -> None:
+    """Per same-dtype group: one stack → mask → fill → cast over ``[n, ...]``, then split back into ``out``."""
+    for names in groups:
+        raw = np.stack([batch[n] for n in names])
+        x = np.where(_is_masked(raw), fill, raw).astype(dtype)
+        for i, n in enumerate(names):
+            out[n] = torch.from_numpy(x[i])
+
+
+def preprocess(batch: dict[str, np.ndarray], plan: PreprocessPlan) -> dict[str, Tensor]:
     """Tokenizer-style per-feature sanitization + per-float mask sidecars.
 
     Operates on either single-sample ``[L]`` arrays or batched ``[B, L]`` — the
@@ -199,28 +335,28 @@ def preprocess(
     target); only FLOAT_FEATURES are normalized. nana follower columns are
     gamestate-only (float/cat), masked for non-Ice-Climbers players. Columns the
     classifier drops (``frame``, ``schema_version``, ``ctx_pad``) are not returned.
+
+    Routing comes precompiled from ``plan`` (see :class:`PreprocessPlan`), and each
+    kind is processed stacked rather than a round of small numpy calls per column:
+    controller channels and categoricals sanitize per same-dtype group, and all
+    float columns normalize together by the plan's per-feature ``[F]`` vectors.
     """
+    lay = plan.layout(batch)
     out: dict[str, Tensor] = {}
-    for name, arr in batch.items():
-        kind = _classify(name)
-        if kind == "drop":
-            continue
-        mask = _is_masked(arr)
-        if kind == "button" or kind == "stick_trigger":
-            x = np.where(mask, 0.0, arr).astype(np.float32)
-        elif kind == "cat":
-            x = np.where(mask, 0, arr).astype(np.int64)
-        elif kind == "float":
-            s = feature_stats[consolidate_key(name)]
-            # percent + position are heavy-tailed: their dataset max (percent ~507, off the
-            # 0-160 decision range) squashes min-max into a sliver, so standardize them.
-            x = _standardize(arr, s) if ("position" in name or "percent" in name) else _normalize(arr, s)
-            x = np.where(mask, 0.0, x)
-        else:
-            raise AssertionError(f"unhandled kind {kind} for {name}")
-        out[name] = torch.from_numpy(np.ascontiguousarray(x))
-        if kind == "float" and mask.any():
-            out[f"{name}_mask"] = torch.from_numpy(np.ascontiguousarray(mask.astype(np.float32)))
+    _sanitize_stacked(batch, lay.controller_groups, 0.0, np.float32, out)
+    _sanitize_stacked(batch, lay.cat_groups, 0, np.int64, out)
+    if lay.float_names:
+        n_float = len(lay.float_names)
+        raw = np.stack([batch[n] for n in lay.float_names]).astype(np.float32, copy=False)
+        bcast = (n_float,) + (1,) * (raw.ndim - 1)
+        mask = np.isnan(raw)
+        x = (raw - lay.shift.reshape(bcast)) * lay.inv_scale.reshape(bcast)
+        x[mask] = 0.0
+        any_masked = mask.reshape(n_float, -1).any(axis=1)
+        for i, name in enumerate(lay.float_names):
+            out[name] = torch.from_numpy(x[i])
+            if any_masked[i]:
+                out[lay.mask_names[i]] = torch.from_numpy(mask[i].astype(np.float32))
     return out
 
 
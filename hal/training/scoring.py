@@ -3,7 +3,7 @@ experiments.
 
 One source of truth so a classification experiment's targets/decode and every run's
 comparison metrics agree byte-for-byte (CLAUDE.md: shared infra never lives in
-``experiments/``). Three groups:
+``experiments/``). Three groups, plus the shared decode sampler (Gumbel-max):
 
 * **discretizers** — uniform per-channel ``BinSpec`` bins, hand-tuned joint-2D stick
   ``cluster`` centers, a 1D hand-tuned ``TRIGGER_CENTERS`` set, plus the single-label
@@ -20,6 +20,7 @@ Stick ranges are ``[-1, 1]`` and trigger ranges ``[0, 1]`` — the action-vector
 conventions in ``hal/training/features.py:action_vec_to_controller``.
 """
 
+import functools
 import math
 from dataclasses import dataclass
 
@@ -189,9 +190,13 @@ STICK_CLUSTER_CENTERS_C: Tensor = torch.tensor(_C_STICK_XY, dtype=torch.float32)
 
 
 def nearest_cluster(xy: Tensor, centers: Tensor) -> Tensor:
-    """``[..., 2]`` stick coords → ``[...]`` index of the nearest (L2) cluster center."""
+    """``[..., 2]`` stick coords → ``[...]`` index of the nearest (L2) cluster center.
+
+    Exact differences, squared in place into the one ``[..., K, 2]`` temporary. Not the expanded
+    ``||c||² - 2·x·c`` matmul form: under autocast / TF32 that dot product loses the precision
+    needed to split centers 1/80 apart, so it could re-bin targets."""
     c = centers.to(xy.device)
-    return (xy.unsqueeze(-2) - c).pow(2).sum(-1).argmin(-1)
+    return (xy.unsqueeze(-2) - c).square_().sum(-1).argmin(-1)
 
 
 def cluster_to_xy(idx: Tensor, centers: Tensor) -> Tensor:
@@ -211,7 +216,7 @@ def nearest_center(x: Tensor, centers: Tensor) -> Tensor:
     """``[...]`` scalar values → ``[...]`` index of the nearest (1D L1) center. The 1D analog
     of ``nearest_cluster`` for per-shoulder triggers."""
     c = centers.to(x.device)
-    return (x.unsqueeze(-1) - c).abs().argmin(-1)
+    return (x.unsqueeze(-1) - c).abs_().argmin(-1)
 
 
 def center_to_value(idx: Tensor, centers: Tensor) -> Tensor:
@@ -219,27 +224,43 @@ def center_to_value(idx: Tensor, centers: Tensor) -> Tensor:
     return centers.to(idx.device)[idx]
 
 
+@functools.cache
+def centers_on(device: torch.device) -> tuple[Tensor, Tensor, Tensor]:
+    """``(main, c, trigger)`` center tables on ``device``, copied once per device and cached.
+    For free-function quantizers with no module to register buffers on: handing the CPU
+    constants straight to ``nearest_cluster`` & co. re-issues a host→device copy every call.
+    Treat the returned tensors as read-only — they are shared."""
+    return (
+        STICK_CLUSTER_CENTERS_MAIN.to(device),
+        STICK_CLUSTER_CENTERS_C.to(device),
+        TRIGGER_CENTERS.to(device),
+    )
+
+
 # --- single-label button class map -------------------------------------------
 def buttons_to_class(buttons: Tensor) -> tuple[Tensor, Tensor]:
     """``[..., 8]`` button bits {0,1} → (``[...]`` class in 0..8, ``[...]`` multi-press mask).
 
     Class 0 = no button; class ``k`` (1..8) = button index ``k-1``. Concurrent presses
     resolve to the lowest button index (priority = ACTION_CHANNELS order); ``multi_press``
-    flags the frames where that one-button assumption was violated."""
-    pressed = buttons > 0.5
-    any_pressed = pressed.any(-1)
-    first = pressed.float().argmax(-1)  # first True == lowest-index pressed
-    cls = torch.where(any_pressed, first + 1, torch.zeros_like(first)).long()
-    multi_press = pressed.sum(-1) >= 2
-    return cls, multi_press
+    flags the frames where that one-button assumption was violated. Both come from one
+    gather each: pack the bits into the combo id, then index the cached priority / popcount
+    tables — no argmax, any, or count reductions over the button axis."""
+    combo = buttons_to_combo(buttons)
+    cls_lut, multi_lut = _class_luts_on(buttons.device)
+    return cls_lut[combo], multi_lut[combo]
 
 
 def class_to_onehot(cls: Tensor, *, n_buttons: int = 8) -> Tensor:
-    """Inverse of ``buttons_to_class``: class 0 → all-zero, class ``k`` → one-hot at ``k-1``."""
-    oh = torch.zeros(*cls.shape, n_buttons, device=cls.device)
-    idx = (cls - 1).clamp(min=0).unsqueeze(-1)
-    oh.scatter_(-1, idx, 1.0)
-    return oh * (cls > 0).unsqueeze(-1)
+    """Inverse of ``buttons_to_class``: class 0 → all-zero, class ``k`` → one-hot at ``k-1``.
+    A single row gather from the cached ``[n_buttons + 1, n_buttons]`` float table (a zero row
+    over the identity) writes the float one-hot directly — no per-class compare, no cast pass."""
+    return _onehot_rows_on(cls.device, n_buttons)[cls]
+
+
+@functools.cache
+def _onehot_rows_on(device: torch.device, n_buttons: int) -> Tensor:
+    return torch.cat([torch.zeros(1, n_buttons), torch.eye(n_buttons)]).to(device)
 
 
 # --- joint button-combo bitmask (256-way) ------------------------------------
@@ -258,26 +279,70 @@ _COMBO_BITS: Tensor = (
 ).float()  # [256, 8]
 
 
+# Per-combo single-label tables: ``_COMBO_CLASS[i]`` = 1 + lowest set bit of i (0 for the
+# empty combo), ``_COMBO_MULTI[i]`` = popcount(i) >= 2. ``buttons_to_class`` is a lookup.
+_COMBO_CLASS: Tensor = torch.where(_COMBO_BITS.any(-1), _COMBO_BITS.argmax(-1) + 1, 0)  # [256] long
+_COMBO_MULTI: Tensor = _COMBO_BITS.sum(-1) >= 2  # [256] bool
+
+
+@functools.cache
+def _class_luts_on(device: torch.device) -> tuple[Tensor, Tensor]:
+    return _COMBO_CLASS.to(device), _COMBO_MULTI.to(device)
+
+
+@functools.cache
+def _bit_weights_on(device: torch.device) -> tuple[Tensor, Tensor]:
+    """``(2**k [8], k [8])`` int64 on ``device`` — built once per device rather than an
+    ``arange`` per call on the per-batch quantize / dequantize path."""
+    shifts = torch.arange(N_BUTTONS, device=device)
+    return 1 << shifts, shifts
+
+
 def buttons_to_combo(buttons: Tensor) -> Tensor:
     """``[..., 8]`` button bits {0,1} → ``[...]`` long combo id in ``[0, 256)``. Bit ``k`` of
     the id is button channel ``k`` (ACTION_CHANNELS order), so the full co-press product is
-    representable and conflicting presses are impossible by construction."""
-    bits = (buttons > 0.5).long()
-    weights = (1 << torch.arange(N_BUTTONS, device=buttons.device)).long()
-    return (bits * weights).sum(-1)
+    representable and conflicting presses are impossible by construction. Packing is
+    branch-free: mask the power-of-two weights by the pressed bits and sum."""
+    weights, _ = _bit_weights_on(buttons.device)
+    return torch.where(buttons > 0.5, weights, 0).sum(-1)
 
 
 def combo_to_buttons(combo: Tensor) -> Tensor:
     """Inverse of ``buttons_to_combo``: ``[...]`` combo id → ``[..., 8]`` float bits {0,1}."""
-    bit = torch.arange(N_BUTTONS, device=combo.device)
-    return ((combo.unsqueeze(-1) >> bit) & 1).float()
+    _, shifts = _bit_weights_on(combo.device)
+    return ((combo.unsqueeze(-1) >> shifts) & 1).float()
+
+
+@functools.cache
+def _combo_bits_on(device: torch.device, dtype: torch.dtype) -> Tensor:
+    return _COMBO_BITS.to(device, dtype)
 
 
 def combo_marginal_probs(logits: Tensor) -> Tensor:
     """Per-button marginal P(bit_k pressed) ∈ [0,1], ``[..., 8]``, from 256-way combo logits
     ``[..., 256]``: ``P(bit_k) = Σ_i softmax(logits)_i · bit_k(i)``. One matmul against the
-    precomputed [256, 8] bit matrix — no Python loop over classes."""
-    return F.softmax(logits, dim=-1) @ _COMBO_BITS.to(logits.device, logits.dtype)
+    precomputed [256, 8] bit matrix (moved to the logits' device once, then cached) — no
+    Python loop over classes."""
+    return F.softmax(logits, dim=-1) @ _combo_bits_on(logits.device, logits.dtype)
+
+
+# --- sampling ---------------------------------------------------------------
+def gumbel_perturb(logits: Tensor, *, temp: float, gen: torch.Generator | None = None) -> Tensor:
+    """``logits / temp + G`` with i.i.d. ``G ~ Gumbel(0, 1)``: the argmax over any slice of the
+    result is an exact sample from that slice's ``softmax(logits / temp)`` (Gumbel-max). One
+    noise fill replaces softmax + multinomial's CDF scan, and one call perturbs every group of a
+    joint logit vector at once. Same distribution as multinomial — not the same draws for a
+    given generator."""
+    u = torch.empty_like(logits).exponential_(generator=gen).clamp_min_(torch.finfo(logits.dtype).tiny)
+    return logits / temp - u.log()
+
+
+def sample_categorical(logits: Tensor, *, temp: float, gen: torch.Generator | None = None) -> Tensor:
+    """One draw per row from ``softmax(logits / temp)`` over the last dim → ``logits.shape[:-1]``:
+    the argmax of :func:`gumbel_perturb` over the whole row, in fp32. Zero-probability (``-inf``)
+    classes stay ``-inf`` after the perturbation, so they are never drawn. Callers sampling several
+    groups out of one joint vector perturb it once with ``gumbel_perturb`` and argmax per slice."""
+    return gumbel_perturb(logits.float(), temp=temp, gen=gen).argmax(-1)
 
 
 # --- proper scoring rules (return bits = nats / ln2) -------------------------
@@ -9,6 +9,7 @@ See CLAUDE.md (Controller data model) for the logical-only
 controller representation and the peppi → MDS → libmelee → Dolphin data flow.
 """
 
+import functools
 from collections.abc import Sequence
 from typing import Final
 
@@ -119,8 +120,15 @@ def mask_value(dtype: DTypeLike) -> float | int:
     - signed int < 4 bytes -> ``np.iinfo(dtype).min`` (e.g. int8 -> -128)
     - signed int >= 4 bytes -> ``MASK_INT32``
     - unsigned int -> ``np.iinfo(dtype).max``
+
+    Resolved once per dtype and cached: extract and the train-time preprocess call this per
+    column, and the ``issubdtype`` / ``iinfo`` dispatch is pure interpreter overhead there.
     """
-    np_dtype = np.dtype(dtype)
+    return _mask_value(np.dtype(dtype))
+
+
+@functools.cache
+def _mask_value(np_dtype: np.dtype) -> float | int:
     if np.issubdtype(np_dtype, np.floating):
         return MASK_FLOAT
     info = np.iinfo(np_dtype)
@@ -10,7 +10,8 @@ Questions it answers, per controller modality:
 * categoricals — observed id ranges vs CAT_FEATURES vocab sizes
 """
 
-import collections
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 from streaming import StreamingDataset
@@ -46,77 +47,130 @@ cols_per_port = [
     "airborne",
 ]
 pool: dict[str, list[np.ndarray]] = {c: [] for c in cols_per_port}
-runlens: dict[str, list[int]] = {b: [] for b in ("a", "b", "x", "y", "z", "r", "l", "d_up")}
+runlens: dict[str, list[np.ndarray]] = {b: [] for b in ("a", "b", "x", "y", "z", "r", "l", "d_up")}
 persist: list[float] = []  # per-replay P(full 14-dim action unchanged frame->frame)
 
-for i in range(min(N_REPLAYS, ds.num_samples)):
-    s = ds[i]
+
+def prefetch(fn, items, workers: int = 4, depth: int = 8):
+    """Yield fn(item) in order, with at most `depth` calls queued or running at once (executor.map
+    would submit every item up front and let decoded results pile up ahead of the consumer)."""
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        pending = deque()
+        for item in items:
+            pending.append(ex.submit(fn, item))
+            if len(pending) >= depth:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+n_rep = min(N_REPLAYS, ds.num_samples)
+# ds[i] is a shard read + zstd decode that drops the GIL; prefetch it on a small thread pool so the
+# next replays decode while this one is pooled. Threads rather than DataLoader workers: samples stay
+# numpy dicts and nothing has to pickle or re-import this script. Assumes concurrent ds[i] is safe,
+# which holds here because every shard is already local (local=ROOT, no remote): a read only opens
+# and decodes its shard file, with no download / eviction state shared across threads.
+for s in prefetch(ds.__getitem__, range(n_rep)):
     for port in ("p1", "p2"):
         for c in cols_per_port:
             pool[c].append(s[f"{port}_{c}"])
-        # button hold run lengths
-        for b in runlens:
-            x = s[f"{port}_button_{b}"].astype(bool)
-            if x.any():
-                edges = np.flatnonzero(np.diff(np.concatenate([[0], x.view(np.int8), [0]])))
-                runlens[b].extend((edges[1::2] - edges[0::2]).tolist())
-        # frame-to-frame persistence of the full action vector
-        a = np.stack([s[f"{port}_{c}"] for c in cols_per_port[:14]], axis=-1)
-        persist.append(float((a[1:] == a[:-1]).all(-1).mean()))
+        # button hold run lengths: one diff over the zero-padded [8, T] press matrix. Row-major
+        # nonzero walks edges grouped by button, alternating press/release, so pairing [0::2]
+        # with [1::2] and splitting at the per-button edge counts covers all 8 in one pass.
+        x = np.zeros((len(runlens), len(s[f"{port}_button_a"]) + 2), dtype=np.int8)
+        for k, b in enumerate(runlens):
+            x[k, 1:-1] = s[f"{port}_button_{b}"].astype(bool)
+        btn_k, t = np.nonzero(np.diff(x, axis=1))
+        lens = np.split(t[1::2] - t[0::2], np.cumsum(np.bincount(btn_k[0::2], minlength=len(runlens)))[:-1])
+        for b, r in zip(runlens, lens):
+            runlens[b].append(r)
+        # frame-to-frame persistence of the full action vector; channel-major [14, T] so every
+        # shifted compare reads contiguous rows, reduced across channels at the end
+        a = np.stack([s[f"{port}_{c}"] for c in cols_per_port[:14]], axis=0)
+        persist.append(float((a[:, 1:] == a[:, :-1]).all(0).mean()))
 
 P = {c: np.concatenate(v) for c, v in pool.items()}
 n = len(P["main_stick_x"])
-print(f"pooled {n:,} frames from {min(N_REPLAYS, ds.num_samples)} replays x 2 ports")
+print(f"pooled {n:,} frames from {n_rep} replays x 2 ports")
 
 
 # %% sticks
-def stick_report(name: str, x: np.ndarray, y: np.ndarray) -> None:
+def stick_report(name: str, x: np.ndarray, y: np.ndarray) -> str:
     neutral = (x == 0) & (y == 0)
 
     def inband(v: np.ndarray) -> np.ndarray:
         return (v != 0) & (np.abs(v) < DEADZONE_STICK)
 
-    print(f"\n== {name} ==")
-    print(
+    out = [f"\n== {name} =="]
+    out.append(
         f"  exact (0,0): {neutral.mean():.3f}   per-axis dead-band leak: x {inband(x).mean():.5f}  y {inband(y).mean():.5f}"
     )
     for ax, v in (("x", x), ("y", y)):
         idx = np.clip(((v + 1.0) / (2.0 / N_BINS)).astype(int), 0, N_BINS - 1)
         occ = np.bincount(idx, minlength=N_BINS) / n
-        print(
+        out.append(
             f"  {ax}: bins<0.1% mass: {(occ < 1e-3).sum()}/{N_BINS}   bins<1%: {(occ < 1e-2).sum()}/{N_BINS}   top bin {occ.max():.3f}"
         )
-    pairs, counts = np.unique(np.stack([x, y], 1), axis=0, return_counts=True)
+    # one uint64 key per float32 (x, y) pair: a 1-D unique instead of axis=0's row-wise lexsort.
+    # Keys compare bits, not values, so fold -0.0 into 0.0 first (-0.0 + 0.0 == +0.0)
+    xy = np.ascontiguousarray(np.stack([x, y], 1), dtype=np.float32)
+    xy += 0.0
+    pairs, counts = np.unique(xy.view(np.uint64).ravel(), return_counts=True)
     order = np.argsort(-counts)
     cum = np.cumsum(counts[order]) / n
     k99, k999 = np.searchsorted(cum, 0.99) + 1, np.searchsorted(cum, 0.999) + 1
-    print(f"  distinct (x,y): {len(pairs):,}   top-32 mass {cum[31]:.3f}   pairs for 99%: {k99}   99.9%: {k999}")
+    out.append(f"  distinct (x,y): {len(pairs):,}   top-32 mass {cum[31]:.3f}   pairs for 99%: {k99}   99.9%: {k999}")
     nz = ~neutral
     mag = np.hypot(x[nz], y[nz])
-    print(
-        f"  non-neutral magnitude: p25 {np.percentile(mag, 25):.2f}  p50 {np.percentile(mag, 50):.2f}  p75 {np.percentile(mag, 75):.2f}  frac>=0.95: {(mag >= 0.95).mean():.3f}"
+    # all quantiles from one partition of the column instead of one full pass per percentile
+    p25, p50, p75 = np.percentile(mag, [25, 50, 75])
+    out.append(
+        f"  non-neutral magnitude: p25 {p25:.2f}  p50 {p50:.2f}  p75 {p75:.2f}  frac>=0.95: {(mag >= 0.95).mean():.3f}"
     )
+    return "\n".join(out)
 
 
-stick_report("main_stick", P["main_stick_x"], P["main_stick_y"])
-stick_report("c_stick", P["c_stick_x"], P["c_stick_y"])
+# the two sticks are independent and their unique / percentile sorts drop the GIL: report both on
+# threads (sharing the pooled columns, no pickling) and print in order once each is done
+with ThreadPoolExecutor(max_workers=2) as ex:
+    reports = [ex.submit(stick_report, name, P[f"{name}_x"], P[f"{name}_y"]) for name in ("main_stick", "c_stick")]
+    for f in reports:
+        print(f.result())
 
 # %% cluster residuals (the 37 hand-tuned centers, applied to both sticks)
 import torch
 
 from hal.training import scoring
 
-centers = scoring.STICK_CLUSTER_CENTERS_MAIN.numpy()
-for name in ("main_stick", "c_stick"):
-    xy = np.stack([P[f"{name}_x"], P[f"{name}_y"]], 1).astype(np.float32)
-    sub = xy[np.random.default_rng(0).choice(len(xy), 500_000, replace=False)]
-    d2 = ((sub[:, None, :] - centers[None]) ** 2).sum(-1)
-    nearest = centers[d2.argmin(1)]
+# the shared tables, converted once to contiguous float32 so every quantizer below reads them as-is
+centers = np.ascontiguousarray(scoring.STICK_CLUSTER_CENTERS_MAIN.numpy(), dtype=np.float32)
+
+
+def q_stick(x, y, centers):
+    # Sticks sit on a coarse grid (a few thousand distinct (x, y) pairs across millions of frames),
+    # so quantize each distinct pair once and scatter back: no [n, K] distance matrix, no block loop.
+    # The float32 pair is viewed as one uint64 key so the dedupe is a 1-D sort, not a row lexsort;
+    # keys compare bits, so -0.0 is folded into 0.0 first (-0.0 + 0.0 == +0.0).
+    xy = np.ascontiguousarray(np.stack([x, y], 1), dtype=np.float32)
+    xy += 0.0
+    keys, inv = np.unique(xy.view(np.uint64).ravel(), return_inverse=True)
+    uxy = keys.view(np.float32).reshape(-1, 2)
+    return ((uxy[:, None, :] - centers[None]) ** 2).sum(-1).argmin(1).astype(np.int32)[inv]
+
+
+pick = np.random.default_rng(0).choice(n, 500_000, replace=False)
+subs = {
+    name: np.stack([P[f"{name}_x"][pick], P[f"{name}_y"][pick]], 1).astype(np.float32)
+    for name in ("main_stick", "c_stick")
+}
+for name, sub in subs.items():
+    lab = q_stick(sub[:, 0], sub[:, 1], centers)
+    nearest = centers[lab]
     err = np.abs(nearest - sub)
     far = (err.max(1) > 0.1).mean()
     print(f"{name}: 37-cluster MAE {err.mean():.4f}   frac>0.1 off {far:.4f}")
     # how much mass per cluster (occupancy)
-    occ = np.bincount(d2.argmin(1), minlength=len(centers)) / len(sub)
+    occ = np.bincount(lab, minlength=len(centers)) / len(sub)
     print(f"   clusters <0.1% mass: {(occ < 1e-3).sum()}/{len(centers)}   top5 {np.sort(occ)[-5:][::-1].round(3)}")
 
 # %% triggers
@@ -127,9 +181,8 @@ for t in ("trigger_l", "trigger_r"):
     print(f"{t}: zero {zero:.4f}  full(1.0) {full:.4f}  analog-band {analog.mean():.4f}", end="")
     if analog.any():
         av = v[analog]
-        print(
-            f"   analog values: p10 {np.percentile(av, 10):.3f} p50 {np.percentile(av, 50):.3f} p90 {np.percentile(av, 90):.3f}  distinct {len(np.unique(av))}"
-        )
+        p10, p50, p90 = np.percentile(av, [10, 50, 90])
+        print(f"   analog values: p10 {p10:.3f} p50 {p50:.3f} p90 {p90:.3f}  distinct {len(np.unique(av))}")
     else:
         print()
 idx = np.clip((P["trigger_l"] / (1.0 / N_BINS)).astype(int), 0, N_BINS - 1)
@@ -141,27 +194,30 @@ print(
 # %% buttons
 B_ORDER = ("a", "b", "x", "y", "z", "r", "l", "d_up")
 btn = np.stack([P[f"button_{b}"] for b in B_ORDER], 1).astype(bool)
-print("press rates:", {b: round(float(btn[:, i].mean()), 4) for i, b in enumerate(B_ORDER)})
+print("press rates:", dict(zip(B_ORDER, btn.mean(0).round(4).tolist())))
 npress = btn.sum(1)
 print(
     f"any-press {float((npress >= 1).mean()):.3f}   multipress(>=2) {float((npress >= 2).mean()):.4f}   (>=3) {float((npress >= 3).mean()):.5f}"
 )
-combo = collections.Counter(map(tuple, btn.astype(np.uint8)))
-top = combo.most_common()
+# combo id = bit k for button k, packed straight from the bool matrix; one bincount over the
+# 256 ids replaces hashing a per-frame tuple into a Counter
+bq = np.packbits(btn, axis=1, bitorder="little")[:, 0]
+combo = np.bincount(bq, minlength=256)
+top = [(int(t), int(combo[t])) for t in np.argsort(-combo, kind="stable") if combo[t]]
 cum = np.cumsum([c for _, c in top]) / n
 print(
-    f"distinct combos: {len(combo)}   combos for 99%: {int(np.searchsorted(cum, 0.99) + 1)}   99.9%: {int(np.searchsorted(cum, 0.999) + 1)}   99.99%: {int(np.searchsorted(cum, 0.9999) + 1)}"
+    f"distinct combos: {len(top)}   combos for 99%: {int(np.searchsorted(cum, 0.99) + 1)}   99.9%: {int(np.searchsorted(cum, 0.999) + 1)}   99.99%: {int(np.searchsorted(cum, 0.9999) + 1)}"
 )
 
 
-def names(t: tuple) -> str:
-    return "+".join(b for b, on in zip(B_ORDER, t) if on) or "none"
+def names(t: int) -> str:
+    return "+".join(b for k, b in enumerate(B_ORDER) if t >> k & 1) or "none"
 
 
 print("top 15 combos:", [(names(t), round(c / n, 4)) for t, c in top[:15]])
-# digital L/R click vs analog: click => analog == 1?
+# digital L/R click vs analog: click => analog == 1? (slices btn's bool columns, no re-cast)
 for b, t in (("l", "trigger_l"), ("r", "trigger_r")):
-    click = P[f"button_{b}"].astype(bool)
+    click = btn[:, B_ORDER.index(b)]
     if click.any():
         print(
             f"button_{b}: P(trigger==1 | click) {float((P[t][click] == 1.0).mean()):.4f}   P(click) {click.mean():.4f}"
@@ -170,11 +226,10 @@ for b, t in (("l", "trigger_l"), ("r", "trigger_r")):
 # %% temporal structure
 print("\nbutton hold lengths (frames):")
 for b in B_ORDER:
-    r = np.array(runlens[b])
+    r = np.concatenate(runlens[b])
     if len(r):
-        print(
-            f"  {b}: n {len(r):,}  p25 {np.percentile(r, 25):.0f}  p50 {np.percentile(r, 50):.0f}  p75 {np.percentile(r, 75):.0f}  mean {r.mean():.1f}"
-        )
+        p25, p50, p75 = np.percentile(r, [25, 50, 75])
+        print(f"  {b}: n {len(r):,}  p25 {p25:.0f}  p50 {p50:.0f}  p75 {p75:.0f}  mean {r.mean():.1f}")
 print(f"\nfull 14-dim action persistence frame->frame: mean {np.mean(persist):.3f}")
 
 # %% categorical id ranges vs CAT_FEATURES vocabs
@@ -187,27 +242,33 @@ for c in ("action", "stock", "jumps_used", "hurtbox_state", "airborne"):
     print(f"{c}: vocab={vocab} dim={dim}   observed [{u.min()}, {u.max()}]  distinct {len(u)}")
 
 # %% chord-vocab viability: quantize (main, c, trig, buttons) jointly per frame
-main_q = d2 = None  # free memory from above if re-running cells
-TRIG_CENTERS = np.array([0.0, 0.35, 0.6, 0.85, 1.0], dtype=np.float32)
-C9 = np.array(
-    [[0, 0], [1, 0], [-1, 0], [0, 1], [0, -1], [0.7, 0.7], [-0.7, 0.7], [0.7, -0.7], [-0.7, -0.7]], dtype=np.float32
-)
+main_q = lab = None  # free memory from above if re-running cells
+TRIG_CENTERS = np.ascontiguousarray(scoring.TRIGGER_CENTERS.numpy(), dtype=np.float32)
+C9 = np.ascontiguousarray(scoring.STICK_CLUSTER_CENTERS_C.numpy(), dtype=np.float32)
 
 
-def q_stick(x, y, centers):
-    xy = np.stack([x, y], 1).astype(np.float32)
-    out = np.empty(len(xy), dtype=np.int32)
-    for i in range(0, len(xy), 1_000_000):
-        blk = xy[i : i + 1_000_000]
-        out[i : i + 1_000_000] = ((blk[:, None, :] - centers[None]) ** 2).sum(-1).argmin(1)
-    return out
-
-
-mq = q_stick(P["main_stick_x"], P["main_stick_y"], centers)  # 37
-cq = q_stick(P["c_stick_x"], P["c_stick_y"], C9)  # 9
-tlq = np.abs(P["trigger_l"][:, None] - TRIG_CENTERS[None]).argmin(1)  # 5
-trq = np.abs(P["trigger_r"][:, None] - TRIG_CENTERS[None]).argmin(1)  # 5
-bq = (btn.astype(np.uint32) * (1 << np.arange(8, dtype=np.uint32))).sum(1)
+# TRIGGER_CENTERS is sorted, so the nearest center is the number of midpoints strictly below v:
+# one O(n log K) searchsorted on float32 instead of an [n, 5] |v - c| matrix; side="left" sends an
+# exact midpoint to the lower center, as argmin's first-minimum tie-break did
+TRIG_MIDS = (TRIG_CENTERS[1:] + TRIG_CENTERS[:-1]) / 2
+
+
+def q_trig(v):
+    return np.searchsorted(TRIG_MIDS, v.astype(np.float32, copy=False), side="left")
+
+
+# the four quantizers are independent and numpy drops the GIL inside their sorts / reductions, so
+# run them concurrently; threads share the pooled columns instead of pickling them to a process pool
+with ThreadPoolExecutor(max_workers=4) as ex:
+    mq, cq, tlq, trq = (
+        f.result()
+        for f in (
+            ex.submit(q_stick, P["main_stick_x"], P["main_stick_y"], centers),  # 37
+            ex.submit(q_stick, P["c_stick_x"], P["c_stick_y"], C9),  # 9
+            ex.submit(q_trig, P["trigger_l"]),  # 5
+            ex.submit(q_trig, P["trigger_r"]),  # 5
+        )
+    )
 
 chord = (((mq.astype(np.int64) * 9 + cq) * 5 + tlq) * 5 + trq) * 256 + bq
 u, cts = np.unique(chord, return_counts=True)
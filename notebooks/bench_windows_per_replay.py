@@ -34,12 +34,13 @@ class _Capped:
             yield s
 
 
-def _mds() -> StreamingDataset:
-    return StreamingDataset(remote=None, local=DATA, batch_size=1, shuffle=False)
+# One dataset for every cell: the index is parsed once, the probe below is a random-access decode
+# of sample 0 (no throwaway iterator), and each sweep arm re-iterates it from the start.
+MDS = StreamingDataset(remote=None, local=DATA, batch_size=1, shuffle=False)
 
 
 # %% validate non-overlap on a real replay (real T, not the synthetic unit-test T)
-sample = next(iter(_mds()))
+sample = MDS[0]
 T = len(sample["frame"])
 cs = _choose_chunk_starts(T, L_CTX, L_CHUNK, K=8, rng=np.random.default_rng(0))
 spans = [(c - L_CTX, c + L_CHUNK) for c in sorted(int(x) for x in cs)]
@@ -47,13 +48,13 @@ assert all(spans[i][1] <= spans[i + 1][0] for i in range(len(spans) - 1)), spans
 print(f"real replay T={T}: {len(cs)} windows, non-overlapping spans OK -> {spans}")
 
 # %% warm up the decompressed-shard cache so timed runs measure steady state
-for _ in WindowDataset(_Capped(_mds(), N_REPLAYS), L_CTX, L_CHUNK, seed=0, windows_per_replay=1):
+for _ in WindowDataset(_Capped(MDS, N_REPLAYS), L_CTX, L_CHUNK, seed=0, windows_per_replay=1):
     pass
 
 # %% timed sweep
 print(f"\n{'K':>4} {'windows':>9} {'wall_s':>8} {'win/s':>9} {'us/replay':>10} {'reads/win':>10}")
 for K in (1, 4, 16, 64):
-    ds = WindowDataset(_Capped(_mds(), N_REPLAYS), L_CTX, L_CHUNK, seed=0, windows_per_replay=K)
+    ds = WindowDataset(_Capped(MDS, N_REPLAYS), L_CTX, L_CHUNK, seed=0, windows_per_replay=K)
     t0 = time.perf_counter()
     n = sum(1 for _ in ds)
     dt = time.perf_counter() - t0
@@ -0,0 +1,87 @@
+"""Correctness contracts for the autoregressive-groups head (experiment 010).
+
+The head's per-group linear over ``[hidden | earlier-group embeddings]`` is stored split by
+input — one fused hidden projection across all groups plus a per-group conditioning linear —
+so the pins here are that a pre-fusion checkpoint (``group_out.{g}`` over the concatenated
+input) loads into the fused layout with identical logits, that the split pieces start at the
+unsplit linear's init scale, and that teacher-forced logits at group g never depend on the
+target classes of groups >= g. The experiment is loaded by path since its filename starts
+with a digit."""
+
+import importlib.util
+from pathlib import Path
+
+import torch
+import torch.nn.functional as F
+
+_EXP_PATH = Path(__file__).resolve().parent.parent / "experiments" / "010_ar_groups.py"
+
+
+def _load_experiment():
+    spec = importlib.util.spec_from_file_location("exp010", _EXP_PATH)
+    mod = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(mod)
+    return mod
+
+
+exp = _load_experiment()
+
+
+def _cfg(**overrides):
+    base = dict(d_model=16, n_layers=1, n_heads=2, d_group=4, L_ctx=6)
+    base.update(overrides)
+    return exp.TrainConfig(**base)
+
+
+def _tgt_idx(B: int, L: int, *, seed: int = 0) -> torch.Tensor:
+    g = torch.Generator().manual_seed(seed)
+    return torch.stack([torch.randint(0, v, (B, L), generator=g) for v in exp._GROUP_VOCABS], dim=-1)
+
+
+def test_pre_fusion_checkpoint_loads_with_identical_logits() -> None:
+    cfg = _cfg()
+    torch.manual_seed(0)
+    model = exp.GPT(cfg)
+    state = model.state_dict()
+    # Rebuild the legacy per-group linears over [hidden | cond] with fresh random weights.
+    legacy_w, legacy_b = [], []
+    for g, v in enumerate(exp._GROUP_VOCABS):
+        legacy_w.append(torch.randn(v, cfg.d_model + g * cfg.d_group))
+        legacy_b.append(torch.randn(v))
+    legacy = {k: t for k, t in state.items() if not k.startswith(("h_out.", "cond_out."))}
+    for g in range(exp.N_GROUPS):
+        legacy[f"group_out.{g}.weight"] = legacy_w[g]
+        legacy[f"group_out.{g}.bias"] = legacy_b[g]
+    model.load_state_dict(legacy)
+
+    h = torch.randn(2, 3, cfg.d_model)
+    tgt = _tgt_idx(2, 3)
+    got = model.head_logits(h, tgt)
+    cond = [h]
+    for g in range(exp.N_GROUPS):
+        want = F.linear(torch.cat(cond, dim=-1), legacy_w[g], legacy_b[g])
+        torch.testing.assert_close(got[g], want, rtol=1e-5, atol=1e-5)
+        if g < exp.N_GROUPS - 1:
+            cond.append(model.group_in[g](tgt[..., g]))
+
+
+def test_head_logits_are_autoregressive_in_groups() -> None:
+    model = exp.GPT(_cfg())
+    h = torch.randn(2, 3, 16)
+    a, b = _tgt_idx(2, 3, seed=0), _tgt_idx(2, 3, seed=1)
+    for g in range(exp.N_GROUPS):
+        # Groups 0..g-1 agree; g and later differ → group g's logits must not move.
+        mixed = torch.cat([a[..., :g], b[..., g:]], dim=-1)
+        torch.testing.assert_close(model.head_logits(h, a)[g], model.head_logits(h, mixed)[g])
+
+
+def test_split_head_init_matches_unsplit_linear_scale() -> None:
+    cfg = _cfg()
+    model = exp.GPT(cfg)
+    rows = model.h_out.weight.split(exp._GROUP_VOCABS)
+    biases = model.h_out.bias.split(exp._GROUP_VOCABS)
+    for g in range(exp.N_GROUPS):
+        bound = (cfg.d_model + g * cfg.d_group) ** -0.5
+        parts = [rows[g], biases[g]] + ([model.cond_out[g - 1].weight] if g else [])
+        assert all(p.abs().max() <= bound for p in parts)
@@ -168,6 +168,14 @@ def test_oov_projection_prefers_same_btn_tl_tr_then_nearest_sticks():
     assert not oov.any() and idx.tolist() == [1, 2, 0]
 
 
+def test_oov_projection_batched_matches_one_at_a_time():
+    vocab = exp.ChordVocab([_pack(0, 0, 0, 0, 0), _pack(1, 0, 0, 0, 5), _pack(30, 0, 0, 0, 5)], [100, 50, 10])
+    q = [_pack(5, 0, 0, 0, 5), _pack(5, 0, 1, 0, 5), _pack(5, 0, 0, 0, 7), _pack(29, 3, 0, 0, 5)]
+    one_at_a_time = [exp.ChordVocab.from_state(vocab.to_state()).encode(torch.tensor([c]))[0].item() for c in q]
+    idx, oov = vocab.encode(torch.tensor(q))
+    assert oov.all() and idx.tolist() == one_at_a_time
+
+
 def test_oov_projection_is_deterministic_and_cached():
     cfg = _cfg()
     q = torch.tensor([_pack(5, 0, 0, 0, 7), _pack(5, 0, 0, 0, 7)])
@@ -5,6 +5,7 @@ from pathlib import Path
 import numpy as np
 import pytest
 
+from hal.data.extract import _arr_to_np
 from hal.data.extract import _list_to_np
 from hal.data.extract import _unpack_buttons
 from hal.data.extract import extract_replay
@@ -17,10 +18,15 @@ from hal.wire import mask_value as _mask_value
 
 
 class _ArrowLike:
-    """Minimal stand-in for a pyarrow Array exposing only ``.to_pylist()``."""
+    """Minimal stand-in for a pyarrow Array: ``.null_count``, ``.to_numpy()``, ``.to_pylist()``."""
 
     def __init__(self, values: list[object]) -> None:
         self._values = values
+        self.null_count = sum(v is None for v in values)
+
+    def to_numpy(self, zero_copy_only: bool = True) -> np.ndarray:
+        assert not zero_copy_only and self.null_count == 0
+        return np.asarray(self._values)
 
     def to_pylist(self) -> list[object]:
         return list(self._values)
@@ -92,6 +98,21 @@ def test_unpack_buttons_decodes_bitmask() -> None:
     assert out["a"].dtype == np.int32
 
 
+def test_unpack_buttons_null_scalar_reads_as_no_press() -> None:
+    a_bit = BUTTON_BITS["a"]
+    out = _unpack_buttons(_ArrowLike([a_bit, None, a_bit]), length=3)
+    assert list(out["a"]) == [1, 0, 1]
+
+
+def test_arr_to_np_null_free_matches_list_path() -> None:
+    values = [0.0, 0.25, -1.0, 1.0]
+    got = _arr_to_np(_ArrowLike(values), np.float32, length=4)
+    assert got.dtype == np.float32
+    np.testing.assert_array_equal(got, _list_to_np(values, np.float32, length=4))
+    with_null = _arr_to_np(_ArrowLike([3, None, 5]), np.int8, length=3)
+    assert list(with_null) == [3, _mask_value(np.int8), 5]
+
+
 def test_unpack_buttons_none_yields_all_zeros() -> None:
     out = _unpack_buttons(None, length=4)
     assert set(out) == set(BUTTON_BITS)
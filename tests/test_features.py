@@ -0,0 +1,164 @@
+"""Pinning tests for ``hal.training.features``: ``preprocess`` and the wire dtypes.
+
+``preprocess`` routes columns through a compiled :class:`PreprocessPlan` and sanitizes /
+normalizes each kind stacked. These pin it against the straightforward per-column
+definition (mask → fill → cast per column, min-max or standardize per float) on masked ints
+and floats, both normalizations, degenerate stats, and key coverage, and pin that a batch
+with the same columns but different dtypes does not reuse another batch's stacking groups.
+The loader's narrowed wire dtypes must round-trip exactly through ``Context.widen``.
+"""
+
+import numpy as np
+import torch
+
+from hal.data.stats import FeatureStats
+from hal.training.features import Context
+from hal.training.features import PreprocessPlan
+from hal.training.features import _classify
+from hal.training.features import _is_masked
+from hal.training.features import preprocess
+from hal.training.features import to_wire
+from hal.training.stats import consolidate_key
+from hal.wire import mask_value
+
+STATS = {
+    "position_x": FeatureStats(mean=1.5, std=40.0, min=-200.0, max=200.0),
+    "position_y": FeatureStats(mean=10.0, std=25.0, min=-100.0, max=150.0),
+    "percent": FeatureStats(mean=60.0, std=45.0, min=0.0, max=507.0),
+    "shield": FeatureStats(mean=55.0, std=8.0, min=0.0, max=60.0),
+    "direction": FeatureStats(mean=1.0, std=0.0, min=1.0, max=1.0),  # degenerate: maps to zeros
+    "hitlag_left": FeatureStats(mean=0.5, std=1.5, min=0.0, max=20.0),
+    "nana_position_x": FeatureStats(mean=0.0, std=30.0, min=-200.0, max=200.0),
+}
+
+
+def _reference(batch: dict[str, np.ndarray]) -> dict[str, torch.Tensor]:
+    """The per-column definition ``preprocess`` must reproduce."""
+    out: dict[str, torch.Tensor] = {}
+    for name, arr in batch.items():
+        kind = _classify(name)
+        if kind == "drop":
+            continue
+        mask = _is_masked(arr)
+        if kind in ("button", "stick_trigger"):
+            x = np.where(mask, 0.0, arr).astype(np.float32)
+        elif kind == "cat":
+            x = np.where(mask, 0, arr).astype(np.int64)
+        else:
+            s = STATS[consolidate_key(name)]
+            if "position" in name or "percent" in name:
+                x = np.zeros_like(arr) if s.std == 0 else (arr - s.mean) / s.std
+            else:
+                x = np.zeros_like(arr) if s.max == s.min else 2.0 * (arr - s.min) / (s.max - s.min) - 1.0
+            x = np.where(mask, 0.0, x).astype(np.float32)
+            if mask.any():
+                out[f"{name}_mask"] = torch.from_numpy(mask.astype(np.float32))
+        out[name] = torch.from_numpy(np.ascontiguousarray(x))
+    return out
+
+
+def _batch(B: int = 3, L: int = 5, *, seed: int = 0) -> dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    batch: dict[str, np.ndarray] = {
+        "frame": np.arange(B * L, dtype=np.int32).reshape(B, L),
+        "ctx_pad": np.zeros(B, dtype=np.int64),
+        "stage": rng.integers(0, 27, (B, L)).astype(np.int32),
+        "ego_character": rng.integers(0, 27, (B, L)).astype(np.int32),
+    }
+    for p in ("ego", "opp"):
+        batch[f"{p}_position_x"] = rng.normal(0, 50, (B, L)).astype(np.float32)
+        batch[f"{p}_position_y"] = rng.normal(0, 50, (B, L)).astype(np.float32)
+        batch[f"{p}_percent"] = rng.uniform(0, 200, (B, L)).astype(np.float32)
+        batch[f"{p}_shield"] = rng.uniform(0, 60, (B, L)).astype(np.float32)
+        batch[f"{p}_direction"] = np.ones((B, L), dtype=np.float32)
+        batch[f"{p}_hitlag_left"] = rng.uniform(0, 20, (B, L)).astype(np.float32)
+        batch[f"{p}_action"] = rng.integers(0, 400, (B, L)).astype(np.int16)
+        batch[f"{p}_stock"] = rng.integers(0, 5, (B, L)).astype(np.int8)
+        batch[f"{p}_main_stick_x"] = rng.uniform(-1, 1, (B, L)).astype(np.float32)
+        batch[f"{p}_trigger_l"] = rng.uniform(0, 1, (B, L)).astype(np.float32)
+        batch[f"{p}_button_a"] = rng.integers(0, 2, (B, L)).astype(np.int32)
+    # masked entries: NaN floats (one normalized feature, one stick), dtype-min int sentinels
+    batch["ego_position_x"][0, 1] = np.nan
+    batch["opp_hitlag_left"][2, 0] = np.nan
+    batch["ego_main_stick_x"][1, 3] = np.nan
+    batch["ego_action"][0, 0] = mask_value(np.int16)
+    batch["opp_stock"][1, 2] = mask_value(np.int8)
+    batch["ego_button_a"][2, 4] = mask_value(np.int32)
+    # an absent nana follower: every frame masked
+    batch["ego_nana_position_x"] = np.full((B, L), np.nan, dtype=np.float32)
+    return batch
+
+
+def _assert_matches_reference(got: dict[str, torch.Tensor], batch: dict[str, np.ndarray]) -> None:
+    want = _reference(batch)
+    assert set(got) == set(want)
+    for k, v in want.items():
+        assert got[k].dtype == v.dtype, k
+        torch.testing.assert_close(got[k], v, rtol=1e-5, atol=1e-5, msg=k)
+
+
+def test_preprocess_matches_per_column_reference() -> None:
+    batch = _batch()
+    _assert_matches_reference(preprocess(batch, PreprocessPlan(STATS)), batch)
+
+
+def test_preprocess_key_coverage() -> None:
+    out = preprocess(_batch(), PreprocessPlan(STATS))
+    assert not {"frame", "ctx_pad"} & set(out)
+    # mask sidecars only for floats that actually had a masked entry
+    assert {k for k in out if k.endswith("_mask")} == {
+        "ego_position_x_mask",
+        "opp_hitlag_left_mask",
+        "ego_nana_position_x_mask",
+    }
+
+
+def test_preprocess_single_sample_shape() -> None:
+    sample = {k: v[0] for k, v in _batch().items() if k != "ctx_pad"}
+    out = preprocess(sample, PreprocessPlan(STATS))
+    _assert_matches_reference(out, sample)
+    assert out["ego_position_x"].shape == (5,)
+
+
+def test_plan_reuses_layout_across_batches() -> None:
+    plan = PreprocessPlan(STATS)
+    for seed in range(3):
+        batch = _batch(seed=seed)
+        _assert_matches_reference(preprocess(batch, plan), batch)
+
+
+def test_plan_recompiles_when_dtypes_change_under_same_names() -> None:
+    plan = PreprocessPlan(STATS)
+    first = _batch()
+    first["opp_stock"] = first["opp_stock"].astype(np.int16)  # same dtype as action: one stacked group
+    first["opp_stock"][1, 2] = mask_value(np.int16)
+    _assert_matches_reference(preprocess(first, plan), first)
+    # same column names, but stock back at int8 with its own (-128) sentinel: reusing the first
+    # batch's int16 group would promote it and leave -128 unmasked
+    second = _batch(seed=1)
+    assert tuple(second) == tuple(first)
+    _assert_matches_reference(preprocess(second, plan), second)
+    assert int(preprocess(second, plan)["opp_stock"][1, 2]) == 0
+
+
+def test_context_widen_restores_compute_dtypes() -> None:
+    ids = torch.tensor([[3, 511]], dtype=torch.int32)
+    btn = torch.tensor([[0, 1]], dtype=torch.uint8)
+    pos = torch.tensor([[0.5, -1.0]])
+    ctx = Context(features={"ego_action": ids, "ego_button_a": btn, "ego_position_x": pos}, ctx_pad=torch.zeros(1))
+    wide = ctx.widen().features
+    assert wide["ego_action"].dtype == torch.int64 and wide["ego_action"].tolist() == [[3, 511]]
+    assert wide["ego_button_a"].dtype == torch.float32 and wide["ego_button_a"].tolist() == [[0.0, 1.0]]
+    assert wide["ego_position_x"] is pos
+
+
+def test_to_wire_round_trips_preprocess_output() -> None:
+    out = preprocess(_batch(), PreprocessPlan(STATS))
+    wire = {k: to_wire(k, v) for k, v in out.items()}
+    assert wire["ego_action"].dtype == torch.int32
+    assert wire["ego_button_a"].dtype == torch.uint8
+    assert wire["ego_main_stick_x"].dtype == torch.float32  # sticks stay float: not exact 0/1
+    back = Context(features=wire, ctx_pad=torch.zeros(3)).widen().features
+    for k, v in out.items():
+        assert back[k].dtype == v.dtype, k
+        torch.testing.assert_close(back[k], v, rtol=0, atol=0, msg=k)
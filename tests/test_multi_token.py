@@ -0,0 +1,81 @@
+"""Correctness contracts for the multi-token GPT (experiment 012).
+
+Pins that a pre-fusion checkpoint (one ``heads.{i}`` linear per offset) loads into the fused
+``heads`` linear with identical per-offset logits, and that the host-side ``Context.padded``
+shortcut is exact: with no sample padded, the mask-free (flash-eligible) attention path gives
+the same hidden as the explicit padding mask. The experiment is loaded by path since its
+filename starts with a digit."""
+
+import importlib.util
+from pathlib import Path
+
+import torch
+import torch.nn.functional as F
+
+_EXP_PATH = Path(__file__).resolve().parent.parent / "experiments" / "012_multi_token.py"
+
+
+def _load_experiment():
+    spec = importlib.util.spec_from_file_location("exp012", _EXP_PATH)
+    mod = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(mod)
+    return mod
+
+
+exp = _load_experiment()
+
+
+def _cfg(**overrides):
+    base = dict(d_model=16, n_layers=1, n_heads=2, L_ctx=6, head_offsets=(1, 3))
+    base.update(overrides)
+    return exp.TrainConfig(**base)
+
+
+def _features(B: int, T: int, *, seed: int = 0) -> dict[str, torch.Tensor]:
+    """A minimal but complete context-feature dict at length T (no _mask sidecars — the model
+    fills missing masks with zeros)."""
+    g = torch.Generator().manual_seed(seed)
+    feats: dict[str, torch.Tensor] = {}
+    for prefix in exp._PLAYER_PREFIXES:
+        for f in exp.FLOAT_FEATURES:
+            feats[f"{prefix}_{f}"] = torch.randn(B, T, generator=g)
+        for cat, (vocab, _) in exp.CAT_FEATURES.items():
+            feats[f"{prefix}_{cat}"] = torch.randint(0, vocab, (B, T), generator=g)
+    for ch in exp.ACTION_CHANNELS:  # ego controller history
+        feats[f"ego_{ch}"] = torch.randn(B, T, generator=g)
+    for name in ("ego_character", "opp_character", "stage"):
+        feats[name] = torch.randint(0, 27, (B, T), generator=g)
+    return feats
+
+
+def test_unpadded_forward_skips_mask_exactly() -> None:
+    cfg = _cfg()
+    torch.manual_seed(0)
+    model = exp.GPT(cfg).eval()
+    feats = _features(2, cfg.L_ctx)
+    pad = torch.zeros(2, dtype=torch.int64)
+    with torch.no_grad():
+        masked = model(feats, pad, padded=True)
+        fast = model(feats, pad, padded=False)
+    torch.testing.assert_close(fast, masked)
+
+
+def test_pre_fusion_checkpoint_loads_with_identical_logits() -> None:
+    cfg = _cfg()
+    torch.manual_seed(0)
+    model = exp.GPT(cfg)
+    legacy = {k: t for k, t in model.state_dict().items() if not k.startswith("heads.")}
+    legacy_w = [torch.randn(exp.A_VOCAB, cfg.d_model) for _ in cfg.head_offsets]
+    legacy_b = [torch.randn(exp.A_VOCAB) for _ in cfg.head_offsets]
+    for i in range(len(cfg.head_offsets)):
+        legacy[f"heads.{i}.weight"] = legacy_w[i]
+        legacy[f"heads.{i}.bias"] = legacy_b[i]
+    assert exp._is_pre_fusion(legacy)
+    model.load_state_dict(legacy)
+
+    h = torch.randn(2, 3, cfg.d_model)
+    got = model.head_logits(h)
+    for i in range(len(cfg.head_offsets)):
+        torch.testing.assert_close(got[..., i, :], F.linear(h, legacy_w[i], legacy_b[i]), rtol=1e-5, atol=1e-5)
+    torch.testing.assert_close(model.primary_logits(h), got[..., model.primary_head_idx, :], rtol=1e-5, atol=1e-5)
@@ -102,6 +102,15 @@ def test_nearest_center_snaps_to_closest_and_preserves_shape():
     assert torch.equal(recon, torch.tensor([[0.0, 1.0], [0.35, 0.6]]))
 
 
+def test_centers_on_is_cached_per_device():
+    cpu = torch.device("cpu")
+    main, c, trig = scoring.centers_on(cpu)
+    assert scoring.centers_on(cpu)[0] is main
+    assert torch.equal(main, scoring.STICK_CLUSTER_CENTERS_MAIN)
+    assert torch.equal(c, scoring.STICK_CLUSTER_CENTERS_C)
+    assert torch.equal(trig, scoring.TRIGGER_CENTERS)
+
+
 # --- button class map (single-label) -----------------------------------------
 def test_buttons_to_class_none_and_single():
     b = torch.zeros(3, 8)
@@ -120,6 +129,15 @@ def test_buttons_to_class_priority_and_multipress_flag():
     assert multi.item() is True
 
 
+def test_buttons_to_class_lut_matches_reference_on_every_combo():
+    b = scoring.combo_to_buttons(torch.arange(scoring.N_BUTTON_COMBOS))
+    cls, multi = scoring.buttons_to_class(b)
+    pressed = b > 0.5
+    want = torch.where(pressed.any(-1), pressed.float().argmax(-1) + 1, 0)
+    assert torch.equal(cls, want)
+    assert torch.equal(multi, pressed.sum(-1) >= 2)
+
+
 def test_class_to_onehot_inverts_single_button():
     b = torch.zeros(4, 8)
     b[0, 0] = 1.0
@@ -175,6 +193,27 @@ def test_combo_marginal_of_one_hot_logit_is_that_combos_bits():
         assert torch.allclose(marg, scoring.combo_to_buttons(torch.tensor(i)), atol=1e-5)
 
 
+# --- sampling ---------------------------------------------------------------
+def test_gumbel_perturb_argmax_matches_tempered_softmax():
+    logits = torch.tensor([2.0, 0.0, -1.0, 0.5])
+    gen = torch.Generator().manual_seed(0)
+    for temp in (1.0, 0.5):
+        draws = scoring.gumbel_perturb(logits.expand(200_000, 4), temp=temp, gen=gen).argmax(-1)
+        freq = torch.bincount(draws, minlength=4).float() / draws.numel()
+        assert torch.allclose(freq, torch.softmax(logits / temp, dim=-1), atol=5e-3)
+
+
+def test_sample_categorical_matches_tempered_softmax_and_skips_zero_mass():
+    logits = torch.tensor([2.0, 0.0, float("-inf"), 0.5])
+    gen = torch.Generator().manual_seed(0)
+    for temp in (1.0, 0.5):
+        draws = scoring.sample_categorical(logits.expand(200_000, 4), temp=temp, gen=gen)
+        assert draws.shape == (200_000,)
+        freq = torch.bincount(draws, minlength=4).float() / draws.numel()
+        assert torch.allclose(freq, torch.softmax(logits / temp, dim=-1), atol=5e-3)
+        assert freq[2] == 0
+
+
 # --- proper scoring rules ----------------------------------------------------
 def test_bernoulli_logloss_uniform_is_one_bit():
     logits = torch.zeros(5, 8)  # p = 0.5 everywhere